@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: rule-table TechDetector vs the original substring-ladder
+analyze_file_content, on large generated manifests.
+
+    python benchmarks/bench_detector.py [--deps 20000] [--repeat 5]
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from tech_detector import TechDetector  # noqa: E402
+
+
+def legacy_analyze_file_content(filename, content, usage):
+    """The pre-rule-table implementation, kept verbatim for comparison"""
+    content_lower = content.lower()
+
+    if filename == 'package.json':
+        try:
+            data = json.loads(content)
+            deps = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
+
+            for dep in deps.keys():
+                if 'react' in dep and 'native' not in dep:
+                    usage['React'] += 5
+                elif 'next' in dep:
+                    usage['Next.js'] += 5
+                elif 'vue' in dep:
+                    usage['Vue'] += 5
+                elif 'angular' in dep:
+                    usage['Angular'] += 5
+                elif 'svelte' in dep:
+                    usage['Svelte'] += 5
+                elif 'express' in dep:
+                    usage['Express'] += 5
+
+        except json.JSONDecodeError:
+            pass
+
+    elif filename == 'requirements.txt' or filename == 'pyproject.toml':
+        for needle, tech in [('django', 'Django'), ('fastapi', 'FastAPI'), ('flask', 'Flask'),
+                             ('tensorflow', 'TensorFlow'), ('torch', 'PyTorch'),
+                             ('transformers', 'Transformers'), ('openai', 'OpenAI')]:
+            if needle in content_lower:
+                usage[tech] += 5
+
+    elif filename == 'Dockerfile':
+        for needle, tech in [('postgres', 'PostgreSQL'), ('mongo', 'MongoDB'), ('redis', 'Redis'), ('mysql', 'MySQL')]:
+            if needle in content_lower:
+                usage[tech] += 3
+
+
+def random_name(rng):
+    return "-".join(rng.choice(["fast", "next", "torch", "vue", "lib", "py", "core", "utils", "data", "x"])
+                    + str(rng.randrange(10_000)) for _ in range(2))
+
+
+def make_manifests(n, seed=0):
+    rng = random.Random(seed)
+    names = [random_name(rng) for _ in range(n)] + ["django", "react", "fastapi"]
+    package_json = json.dumps({"dependencies": {name: "^1.0.0" for name in names}})
+    requirements = "\n".join(f"{name}>=1.0  # pinned" for name in names)
+    pyproject = "[project]\ndependencies = [\n" + ",\n".join(f'  "{name}>=1.0"' for name in names) + "\n]\n"
+    dockerfile = "\n".join(f"RUN pip install {name}" for name in names) + "\nFROM postgres:15\n"
+    return {
+        "package.json": package_json,
+        "requirements.txt": requirements,
+        "pyproject.toml": pyproject,
+        "Dockerfile": dockerfile,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--deps", type=int, default=20_000, help="Dependencies per generated manifest")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    manifests = make_manifests(args.deps)
+    print(f"{'manifest':<18}{'size':>10}{'legacy ms':>12}{'cold ms':>10}{'warm ms':>10}  legacy / new detections")
+
+    for filename, content in manifests.items():
+        def legacy():
+            usage = defaultdict(int)
+            legacy_analyze_file_content(filename, content, usage)
+            return usage
+
+        def cold():
+            return TechDetector().detect(filename, content)
+
+        warm_detector = TechDetector()
+        warm_detector.detect(filename, content)
+
+        timings = {}
+        for label, fn in (("legacy", legacy), ("cold", cold), ("warm", lambda: warm_detector.detect(filename, content))):
+            timings[label] = min(timeit.repeat(fn, number=1, repeat=args.repeat)) * 1000
+
+        print(f"{filename:<18}{len(content):>10,}{timings['legacy']:>12.2f}{timings['cold']:>10.2f}{timings['warm']:>10.2f}"
+              f"  {sorted(legacy())} / {sorted(cold())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GitHub API endpoints GitHubRepoAnalyzer uses, serving
+synthetic accounts generated from a seed.
+
+Serves the repo listing (with Link pagination), languages, git trees and
+blobs, contents, releases, contributors and the GraphQL repositories query,
+with ETag / 304 support, configurable latency and X-RateLimit-* headers.
+Counts requests and bytes per endpoint; GET /_bench/stats returns the
+counters and GET /_bench/reset clears them (neither is counted).
+
+    python benchmarks/fake_github.py --repos 100 --port 8765
+
+--export-git DIR also writes the account as bare git repositories under
+DIR/<login>/<name>.git, whose files match the served languages and
+manifests, for offline runs of the clone backend.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import subprocess
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'Shell', 'HTML', 'CSS', 'Dart', 'C++']
+NPM_DEPS = ['react', 'react-dom', 'next', 'vue', 'express', 'pg', 'mongoose', 'redis', 'lodash', 'axios', 'zod']
+PYPI_DEPS = ['django', 'fastapi', 'flask', 'torch', 'transformers', 'openai', 'requests', 'numpy', 'psycopg2-binary']
+DOCKER_IMAGES = ['python:3.11-slim', 'node:20', 'postgres:15', 'redis:7', 'nginx:alpine']
+EXTENSIONS = {'Python': 'py', 'JavaScript': 'js', 'TypeScript': 'ts', 'Go': 'go', 'Rust': 'rs', 'Shell': 'sh',
+              'HTML': 'html', 'CSS': 'css', 'Dart': 'dart', 'C++': 'cpp'}
+
+
+def git_blob_sha(content):
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def _template_manifests(rng):
+    """A handful of shared templates, so byte-identical manifests recur across repos like real accounts"""
+    templates = []
+    for _ in range(6):
+        files = {}
+        if rng.random() < 0.6:
+            deps = rng.sample(NPM_DEPS, rng.randint(2, 6))
+            files['package.json'] = json.dumps({'dependencies': {d: '^1.0.0' for d in deps}}, indent=2)
+        if rng.random() < 0.6:
+            files['requirements.txt'] = "\n".join(f"{d}>=1.0" for d in rng.sample(PYPI_DEPS, rng.randint(2, 5)))
+        if rng.random() < 0.4:
+            files['Dockerfile'] = f"FROM {rng.choice(DOCKER_IMAGES)}\nCOPY . /app\n"
+        templates.append(files)
+    return templates
+
+
+def generate_account(login, n_repos, seed=0):
+    """Deterministic synthetic account: {'login', 'repos': [...], 'details': {name: {...}}, 'blobs': {sha: bytes}}"""
+    rng = random.Random(f"{seed}:{login}:{n_repos}")
+    templates = _template_manifests(rng)
+    repos, details, blobs = [], {}, {}
+
+    for i in range(n_repos):
+        name = f"project-{i:05d}"
+        created = 1_600_000_000 + i * 3600
+        pushed = created + rng.randint(0, 90_000_000)
+        # Long-tailed popularity: most repos have nothing
+        stars = int(rng.paretovariate(1.3)) - 1 if rng.random() < 0.35 else 0
+        forks = stars // rng.randint(2, 6) if stars else 0
+
+        files = dict(rng.choice(templates))
+        if rng.random() < 0.25:
+            files = {f"{sub}/{path}": body for sub in ('frontend', 'backend') for path, body in files.items()}
+        tree = [{'path': 'README.md', 'type': 'blob', 'sha': git_blob_sha(b'# readme\n'), 'size': 9}]
+        tree += [{'path': f'src/module_{k}.py', 'type': 'blob', 'sha': f'{i:08x}{k:032x}', 'size': 100}
+                 for k in range(rng.randint(1, 8))]
+        for path, body in files.items():
+            raw = body.encode('utf-8')
+            sha = git_blob_sha(raw)
+            blobs[sha] = raw
+            tree.append({'path': path, 'type': 'blob', 'sha': sha, 'size': len(raw)})
+
+        iso = lambda ts: time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(ts))
+        repos.append({
+            'id': 1000 + i,
+            'name': name,
+            'full_name': f"{login}/{name}",
+            'owner': {'login': login, 'type': 'User'},
+            'private': False,
+            'fork': rng.random() < 0.1,
+            'archived': rng.random() < 0.05,
+            'description': f"Synthetic project {i}" if rng.random() < 0.8 else None,
+            'html_url': f"https://github.com/{login}/{name}",
+            'homepage': f"https://{name}.example.com" if rng.random() < 0.1 else None,
+            'language': rng.choice(LANGUAGES),
+            'stargazers_count': stars,
+            'watchers_count': stars,
+            'forks_count': forks,
+            'open_issues_count': rng.randint(0, 5),
+            'size': rng.randint(10, 80_000),
+            'default_branch': 'main',
+            'created_at': iso(created),
+            'updated_at': iso(pushed + 60),
+            'pushed_at': iso(pushed),
+            # Padding standing in for the ~90 fields of a real listing
+            **{f'{key}_url': f"https://api.github.com/repos/{login}/{name}/{key}"
+               for key in ('hooks', 'issues', 'pulls', 'tags', 'teams', 'events', 'branches', 'commits', 'labels')},
+        })
+
+        n_releases = rng.randint(0, 8) if stars else 0
+        details[name] = {
+            'languages': {lang: rng.randint(500, 400_000) for lang in rng.sample(LANGUAGES, rng.randint(1, 4))},
+            'tree': tree,
+            'files': files,
+            'releases': [
+                {'tag_name': f"v1.{k}.0", 'name': f"v1.{k}.0", 'html_url': f"https://github.com/{login}/{name}/releases/v1.{k}.0",
+                 'published_at': iso(pushed - k * 86400 * 30), 'assets': [], 'body': 'x' * 400}
+                for k in range(n_releases)
+            ],
+            'contributors': [
+                {'login': f"user{k}", 'contributions': rng.randint(1, 300)}
+                for k in range(rng.randint(1, 12) if stars else 1)
+            ],
+        }
+
+    return {'login': login, 'repos': repos, 'details': details, 'blobs': blobs}
+
+
+def export_git(account, directory):
+    """Write each repo as a bare repository with one commit: its manifests, README.md and, per
+    served language, a source file of that many bytes (the synthetic module files are left out)"""
+    for repo in account['repos']:
+        detail = account['details'][repo['name']]
+        files = {'README.md': b'# readme\n'}
+        files.update({path: body.encode('utf-8') for path, body in detail['files'].items()})
+        for lang, size in detail['languages'].items():
+            files[f"src/code.{EXTENSIONS[lang]}"] = (b'x' * 79 + b'\n') * (size // 80) + b'x' * (size % 80)
+
+        git_dir = f"{directory}/{repo['full_name']}.git"
+        subprocess.run(['git', 'init', '--quiet', '--bare', git_dir], check=True)
+        subprocess.run(['git', '--git-dir', git_dir, 'config', 'uploadpack.allowFilter', 'true'], check=True)
+        subprocess.run(['git', '--git-dir', git_dir, 'symbolic-ref', 'HEAD', 'refs/heads/main'], check=True)
+        stream = [b'commit refs/heads/main\n', b'committer Fake <fake@example.com> 1600000000 +0000\n', b'data 0\n']
+        for path, raw in sorted(files.items()):
+            stream += [f"M 100644 inline {path}\ndata {len(raw)}\n".encode(), raw, b'\n']
+        subprocess.run(['git', '--git-dir', git_dir, 'fast-import', '--quiet'], input=b''.join(stream), check=True)
+
+
+class FakeGitHub:
+    def __init__(self, accounts, latency=0.0, rate_limit=None, page_size_cap=100, error_rate=0.0,
+                 stall_rate=0.0, stall=0.0):
+        self.accounts = {a['login']: a for a in accounts}
+        self.latency = latency
+        # Injected faults: a fraction of GETs answer 502, another fraction stall for `stall` seconds
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.fault_rng = random.Random(0)
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self.page_size_cap = page_size_cap
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.bytes = Counter()
+        self.not_modified = 0
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests.clear()
+            self.bytes.clear()
+            self.not_modified = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                'requests': sum(self.requests.values()),
+                'bytes': sum(self.bytes.values()),
+                'not_modified': self.not_modified,
+                'by_endpoint': {k: {'requests': self.requests[k], 'bytes': self.bytes[k]} for k in sorted(self.requests)},
+            }
+
+    def record(self, endpoint, nbytes, status):
+        with self.lock:
+            self.requests[endpoint] += 1
+            self.bytes[endpoint] += nbytes
+            if status == 304:
+                self.not_modified += 1
+            # Like GitHub, 304s don't count against the budget
+            if self.remaining is not None and status != 304:
+                self.remaining = max(self.remaining - 1, 0)
+            return self.remaining
+
+    def rate_limit_headers(self, remaining):
+        if self.rate_limit is None:
+            return {}
+        return {
+            'X-RateLimit-Limit': str(self.rate_limit),
+            'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': str(self.reset_at),
+        }
+
+    # --- Routing: return (endpoint, status, payload, extra headers) ---
+
+    def route(self, path, query):
+        if path == '/rate_limit':
+            budget = {'limit': self.rate_limit or 5000, 'remaining': self.remaining if self.rate_limit else 5000,
+                      'reset': self.reset_at, 'used': (self.rate_limit - self.remaining) if self.rate_limit else 0}
+            return 'rate_limit', 200, {'resources': {'core': budget, 'graphql': budget}}, {}
+        m = re.fullmatch(r'/(users|orgs)/([^/]+)/repos', path)
+        if m:
+            account = self.accounts.get(m.group(2))
+            if not account:
+                return 'repos', 404, {'message': 'Not Found'}, {}
+            per_page = min(int(query.get('per_page', ['30'])[0]), self.page_size_cap)
+            page = int(query.get('page', ['1'])[0])
+            repos = account['repos']
+            last = max((len(repos) + per_page - 1) // per_page, 1)
+            base = f"{path}?per_page={per_page}"
+            links = []
+            if page < last:
+                links.append(f'<{base}&page={page + 1}>; rel="next"')
+                links.append(f'<{base}&page={last}>; rel="last"')
+            headers = {'Link': ", ".join(links)} if links else {}
+            return 'repos', 200, repos[(page - 1) * per_page:page * per_page], headers
+
+        m = re.fullmatch(r'/repos/([^/]+)/([^/]+)', path)
+        if m:
+            account = self.accounts.get(m.group(1))
+            repo = account and next((r for r in account['repos'] if r['name'] == m.group(2)), None)
+            if not repo:
+                return 'repo', 404, {'message': 'Not Found'}, {}
+            return 'repo', 200, repo, {}
+
+        m = re.fullmatch(r'/repos/([^/]+)/([^/]+)/(.+)', path)
+        if not m:
+            return 'unknown', 404, {'message': 'Not Found'}, {}
+        login, name, rest = m.groups()
+        account = self.accounts.get(login)
+        detail = account and account['details'].get(name)
+        if not detail:
+            return rest.split('/')[0], 404, {'message': 'Not Found'}, {}
+
+        if rest == 'languages':
+            return 'languages', 200, detail['languages'], {}
+        if rest.startswith('git/trees/'):
+            return 'trees', 200, {'sha': 'root', 'tree': detail['tree'], 'truncated': False}, {}
+        if rest.startswith('git/blobs/'):
+            raw = account['blobs'].get(rest[len('git/blobs/'):])
+            if raw is None:
+                return 'blobs', 404, {'message': 'Not Found'}, {}
+            return 'blobs', 200, {'encoding': 'base64', 'size': len(raw), 'content': base64.b64encode(raw).decode()}, {}
+        if rest.startswith('contents/'):
+            body = detail['files'].get(rest[len('contents/'):])
+            if body is None:
+                return 'contents', 404, {'message': 'Not Found'}, {}
+            raw = body.encode('utf-8')
+            return 'contents', 200, {'type': 'file', 'sha': git_blob_sha(raw), 'encoding': 'base64',
+                                     'content': base64.b64encode(raw).decode()}, {}
+        if rest in ('releases', 'contributors', 'commits'):
+            items = detail.get(rest, [])
+            if rest == 'commits':
+                items = [{'sha': f"{k:040x}"} for k in range(sum(c['contributions'] for c in detail['contributors']))]
+            per_page = min(int(query.get('per_page', ['30'])[0]), 100)
+            page = int(query.get('page', ['1'])[0])
+            last = max((len(items) + per_page - 1) // per_page, 1)
+            headers = {}
+            if last > 1:
+                headers['Link'] = (f'</repos/{login}/{name}/{rest}?per_page={per_page}&page={min(page + 1, last)}>; rel="next", '
+                                   f'</repos/{login}/{name}/{rest}?per_page={per_page}&page={last}>; rel="last"')
+            return rest, 200, items[(page - 1) * per_page:page * per_page], headers
+        if rest == 'releases/latest':
+            if not detail['releases']:
+                return 'releases', 404, {'message': 'Not Found'}, {}
+            return 'releases', 200, detail['releases'][0], {}
+        return rest.split('/')[0], 404, {'message': 'Not Found'}, {}
+
+    def graphql(self, request):
+        variables = request.get('variables', {})
+        account = self.accounts.get(variables.get('login'))
+        if not account:
+            return {'data': {'repositoryOwner': None}}
+        first = variables.get('first', 25)
+        start = int(variables.get('after') or 0)
+        repos = account['repos'][start:start + first]
+
+        nodes = []
+        for repo in repos:
+            detail = account['details'][repo['name']]
+            latest = detail['releases'][0] if detail['releases'] else None
+            node = {
+                'name': repo['name'], 'nameWithOwner': repo['full_name'], 'owner': {'login': account['login']},
+                'description': repo['description'], 'url': repo['html_url'], 'homepageUrl': repo['homepage'],
+                'isFork': repo['fork'], 'isArchived': repo['archived'], 'isPrivate': False,
+                'stargazerCount': repo['stargazers_count'], 'forkCount': repo['forks_count'], 'diskUsage': repo['size'],
+                'createdAt': repo['created_at'], 'updatedAt': repo['updated_at'], 'pushedAt': repo['pushed_at'],
+                'primaryLanguage': {'name': repo['language']}, 'watchers': {'totalCount': repo['watchers_count']},
+                'issues': {'totalCount': repo['open_issues_count']}, 'pullRequests': {'totalCount': 0},
+                # The owner; on GitHub this counts collaborators, not commit authors
+                'mentionableUsers': {'totalCount': 1},
+                'defaultBranchRef': {'name': 'main', 'target': {'history': {
+                    'totalCount': sum(c['contributions'] for c in detail['contributors'])}}},
+                'languages': {'edges': [{'size': size, 'node': {'name': lang}} for lang, size in detail['languages'].items()]},
+                'releases': {'totalCount': len(detail['releases'])},
+                'latestRelease': {'tagName': latest['tag_name'], 'name': latest['name'],
+                                  'publishedAt': latest['published_at'], 'url': latest['html_url']} if latest else None,
+            }
+            nodes.append(node)
+
+        end = start + len(repos)
+        return {'data': {'repositoryOwner': {'repositories': {
+            'pageInfo': {'hasNextPage': end < len(account['repos']), 'endCursor': str(end)},
+            'nodes': nodes,
+        }}}}
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Send headers and body as one segment; avoids Nagle / delayed-ACK stalls on keep-alive
+            wbufsize = 64 * 1024
+            disable_nagle_algorithm = True
+
+            def send_payload(self, endpoint, status, payload, headers):
+                body = json.dumps(payload).encode('utf-8')
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    status, body = 304, b''
+                remaining = server.record(endpoint, len(body), status)
+                if 'Link' in headers:
+                    # Absolute URLs, like the real API
+                    headers = dict(headers, Link=headers['Link'].replace('</', f"<http://{self.headers.get('Host')}/"))
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                if status in (200, 304) and endpoint != 'graphql':
+                    self.send_header('ETag', etag)
+                for key, value in {**server.rate_limit_headers(remaining), **headers}.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/_bench/stats':
+                    body = json.dumps(server.stats()).encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                if url.path == '/_bench/reset':
+                    server.reset_stats()
+                    self.send_response(204)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if server.latency:
+                    time.sleep(server.latency)
+                if server.remaining == 0:
+                    self.send_payload('rate_limited', 403, {'message': 'API rate limit exceeded'}, {})
+                    return
+                with server.lock:
+                    fault = server.fault_rng.random()
+                if fault < server.error_rate:
+                    self.send_payload('bad_gateway', 502, {'message': 'Server Error'}, {})
+                    return
+                if fault < server.error_rate + server.stall_rate:
+                    time.sleep(server.stall)
+                self.send_payload(*server.route(url.path, parse_qs(url.query)))
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if server.latency:
+                    time.sleep(server.latency)
+                if urlparse(self.path).path != '/graphql':
+                    self.send_payload('unknown', 404, {'message': 'Not Found'}, {})
+                    return
+                self.send_payload('graphql', 200, server.graphql(request), {})
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def serve(self, host='127.0.0.1', port=0):
+        """Start serving in a background thread; returns the base URL"""
+        self.httpd = ThreadingHTTPServer((host, port), self.make_handler())
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return f"http://{host}:{self.httpd.server_port}"
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic GitHub account locally")
+    parser.add_argument('--login', default='musiliandrew')
+    parser.add_argument('--repos', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds of delay per request")
+    parser.add_argument('--rate-limit', type=int, default=None, help="Emit X-RateLimit-* headers with this budget")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of GETs answered with 502")
+    parser.add_argument('--stall-rate', type=float, default=0.0, help="Fraction of GETs delayed by --stall seconds")
+    parser.add_argument('--stall', type=float, default=5.0)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--export-git', metavar='DIR', help="Also write the repos as bare git repositories under DIR")
+    args = parser.parse_args()
+
+    account = generate_account(args.login, args.repos, args.seed)
+    if args.export_git:
+        export_git(account, args.export_git)
+        print(f"Wrote {args.repos} bare repositories under {args.export_git}/{args.login}")
+        print(f"  ANALYZER_CLONE_URL={args.export_git}/{{full_name}}.git python scripts/analyze_repos.py --backend clone")
+    fake = FakeGitHub([account], args.latency, args.rate_limit,
+                      error_rate=args.error_rate, stall_rate=args.stall_rate, stall=args.stall)
+    url = fake.serve(port=args.port)
+    print(f"Serving {args.repos} synthetic repos for {args.login} at {url} (Ctrl+C to stop)")
+    print(f"  GITHUB_API_URL={url} python scripts/analyze_repos.py")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fake.shutdown()
+
+
+if __name__ == '__main__':
+    main()
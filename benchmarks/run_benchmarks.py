@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of analyze_repos.py against the local GitHub stand-in.
+
+For each synthetic account size the analyzer runs in a fresh subprocess (so
+peak RSS is per size) through the same phases as main(): repo fetch,
+language analysis, badge generation, popular-repo ranking and README
+rewrite. Each phase reports wall time, request count, bytes transferred and
+its own peak RSS, sampled every few milliseconds while it runs (Linux; other
+platforms fall back to ru_maxrss, the peak of the process so far). Results are written as JSON to benchmarks/results/ so runs of
+different versions can be diffed.
+
+    python benchmarks/run_benchmarks.py --sizes 10 100 1000 5000 --latency 0.005
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+RESULTS_DIR = BENCH_DIR / "results"
+
+sys.path.insert(0, str(BENCH_DIR))
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def current_rss_mb():
+    """Resident set size right now, or None without /proc"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class RssSampler:
+    """Samples the current RSS in a background thread; peak() is the highest sample since reset().
+
+    ru_maxrss only ever grows, so it can't tell one phase's peak from an
+    earlier phase's.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._peak = current_rss_mb()
+        self._lock = threading.Lock()
+        if self._peak is not None:
+            threading.Thread(target=self._sample, daemon=True).start()
+
+    def _sample(self):
+        while True:
+            time.sleep(self.interval)
+            rss = current_rss_mb()
+            with self._lock:
+                self._peak = max(self._peak, rss)
+
+    def reset(self):
+        if self._peak is not None:
+            with self._lock:
+                self._peak = current_rss_mb()
+
+    def peak(self):
+        if self._peak is None:
+            return peak_rss_mb()
+        with self._lock:
+            return round(max(self._peak, current_rss_mb()), 1)
+
+
+def bench_call(api_url, path):
+    with urllib.request.urlopen(f"{api_url}{path}") as response:
+        body = response.read()
+    return json.loads(body) if body else None
+
+
+def run_worker(args):
+    """Run main()'s phases in this process against GITHUB_API_URL and print a JSON report"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    import analyze_repos
+    from http_cache import ResponseCache
+    from rate_limit import RateLimitScheduler
+    from repo_snapshot import SnapshotStore
+
+    api_url = os.environ["GITHUB_API_URL"]
+    os.chdir(args.workdir)
+    rss = RssSampler()
+
+    def one_run():
+        cache = ResponseCache() if args.cache else None
+        snapshot = SnapshotStore() if args.snapshot else None
+        # The stand-in has no secondary limits; don't let pacing dominate the measurement
+        scheduler = RateLimitScheduler(rate=args.pace, burst=max(args.workers, 1))
+        analyzer = analyze_repos.GitHubRepoAnalyzer(
+            args.login, "bench-token", cache=cache, max_workers=args.workers,
+            backend=args.backend, snapshot=snapshot, scheduler=scheduler)
+
+        state = {}
+        phases = [
+            ("repo_fetch", lambda: state.update(repos=analyzer.get_repositories())),
+            ("language_analysis", lambda: analyzer.analyze_repository_languages(state["repos"])),
+            ("badge_generation", lambda: state.update(badges=analyzer.generate_tech_badges())),
+            ("popular_ranking", lambda: state.update(popular=analyzer.get_popular_repos(state["repos"]))),
+            ("readme_rewrite", lambda: analyzer.update_readme(state["badges"], state["popular"])),
+        ]
+
+        report = {}
+        for name, phase in phases:
+            bench_call(api_url, "/_bench/reset")
+            rss.reset()
+            start = time.perf_counter()
+            phase()
+            wall = time.perf_counter() - start
+            stats = bench_call(api_url, "/_bench/stats")
+            report[name] = {
+                "wall_s": round(wall, 4),
+                "requests": stats["requests"],
+                "bytes": stats["bytes"],
+                "not_modified": stats["not_modified"],
+                "peak_rss_mb": rss.peak(),
+                "by_endpoint": stats["by_endpoint"],
+            }
+        if snapshot:
+            snapshot.save()
+        report["_summary"] = {
+            "repos": len(state["repos"]),
+            "technologies": len(analyzer.tech_usage),
+            "featured": [repo["name"] for repo in state["popular"]],
+        }
+        return report
+
+    # The analyzer prints progress; keep stdout for the report
+    with contextlib.redirect_stdout(sys.stderr):
+        runs = [one_run() for _ in range(2 if args.warm else 1)]
+    json.dump({"cold": runs[0], "warm": runs[1] if args.warm else None}, sys.stdout)
+
+
+def bench_size(args, size):
+    from fake_github import FakeGitHub, generate_account
+
+    fake = FakeGitHub([generate_account(args.login, size, args.seed)], args.latency, args.rate_limit)
+    api_url = fake.serve()
+    workdir = tempfile.mkdtemp(prefix=f"readme-bench-{size}-")
+    shutil.copy(REPO_ROOT / "README.md", Path(workdir) / "README.md")
+    try:
+        cmd = [sys.executable, __file__, "--worker", "--workdir", workdir,
+               "--login", args.login, "--workers", str(args.workers), "--backend", args.backend,
+               "--pace", str(args.pace)]
+        cmd += ["--cache"] if args.cache else []
+        cmd += ["--snapshot"] if args.snapshot else []
+        cmd += ["--warm"] if args.warm else []
+        env = dict(os.environ, GITHUB_API_URL=api_url)
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"worker failed for {size} repos:\n{proc.stderr}")
+        return json.loads(proc.stdout)
+    finally:
+        fake.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_table(size, report):
+    print(f"\n{size} repos")
+    print(f"  {'phase':<20}{'wall s':>10}{'requests':>10}{'KiB':>12}{'304s':>8}{'peak MB':>10}")
+    for name, phase in report.items():
+        if name.startswith("_"):
+            continue
+        print(f"  {name:<20}{phase['wall_s']:>10.3f}{phase['requests']:>10}{phase['bytes'] / 1024:>12.1f}"
+              f"{phase['not_modified']:>8}{phase['peak_rss_mb']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the README analyzer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--login", default="musiliandrew")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay per stand-in request")
+    parser.add_argument("--rate-limit", type=int, default=None, help="Budget advertised in X-RateLimit-* headers")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--backend", choices=["rest", "graphql"], default="rest")
+    parser.add_argument("--pace", type=float, default=1e9, help="Scheduler requests/second (default: unpaced)")
+    parser.add_argument("--cache", action="store_true", help="Enable the conditional-request cache")
+    parser.add_argument("--snapshot", action="store_true", help="Enable the per-repo snapshot")
+    parser.add_argument("--warm", action="store_true", help="Run twice and also report the second (warm) run")
+    parser.add_argument("--label", default=None, help="Results file name (default: git revision)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    results = {
+        "label": args.label or git_rev(),
+        "git_rev": git_rev(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("worker", "workdir", "label")},
+        "accounts": {},
+    }
+    for size in args.sizes:
+        report = bench_size(args, size)
+        results["accounts"][str(size)] = report
+        print_table(size, report["cold"])
+        if report["warm"]:
+            print("  warm:")
+            print_table(size, report["warm"])
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out = RESULTS_DIR / f"{results['label']}.json"
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {out.relative_to(REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,39 @@
 #!/usr/bin/env python3
+import argparse
+import heapq
+import multiprocessing
 import requests
 import json
 import os
-from collections import defaultdict
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from api_archive import ArchiveRecorder, ArchiveReplayer
+from blob_store import BlobStore
+from http_cache import ResponseCache
+from http_client import ResilientSession
+from instrumentation import RunMetrics
+from git_mirror import GitMirror
+from github_graphql import GraphQLSource
+from ranking import load_weights, listing_score, detail_score, detail_bound
+from repo_events import METRICS_EVENTS, load_events
+from repo_record import RepoRecord, last_page
+from repo_snapshot import SnapshotStore, trim_release
+from shards import (default_partial_path, in_shard, merge_partials, parse_range, parse_shard, shard_label,
+                    write_partial)
+from tech_detector import detect_encoded, detect_technologies
+from svg_badges import DEFAULT_BADGE_DIR, BadgeSet, parse_shield
+from rate_limit import (RateLimitScheduler, BudgetExhausted, endpoint_name,
+                        PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW)
+from readme_sections import README_PATH, plan_sections, unified_diff, update_sections, wrap_section, write_atomic
+
+# Overridable so the analyzer can be pointed at GitHub Enterprise or a local stand-in
+API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+GRAPHQL_URL = os.getenv('GITHUB_GRAPHQL_URL', f'{API_URL}/graphql')
 
 # Tech stack mapping with shield badges
 TECH_MAPPING = {
@@ -59,178 +89,523 @@ TECH_MAPPING = {
     'Azure': '![Azure](https://img.shields.io/badge/Microsoft_Azure-0089D0?style=for-the-badge&logo=microsoft-azure&logoColor=white)',
 }
 
+# Badge categories of the tech stack section: (key, heading, technologies)
+TECH_CATEGORIES = [
+    ('languages', '🔥 Languages', ['Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'Rust', 'C++', 'C', 'PHP', 'Ruby', 'Swift', 'Kotlin', 'Dart', 'Shell']),
+    ('frontend', '⚡ Frontend', ['React', 'Next.js', 'Vue', 'Angular', 'Svelte']),
+    ('backend', '🔧 Backend', ['Django', 'FastAPI', 'Flask', 'Express', 'Node.js', 'Spring']),
+    ('ai_ml', '🤖 AI/ML', ['TensorFlow', 'PyTorch', 'OpenAI', 'Transformers']),
+    ('databases', '🗄️ Databases', ['PostgreSQL', 'MongoDB', 'Redis', 'MySQL', 'SQLite']),
+    ('cloud_devops', '☁️ Cloud & DevOps', ['Docker', 'Kubernetes', 'AWS', 'GCP', 'Azure']),
+]
+
+# Manifest file names discovered at any depth of a repo's tree, in analysis order
+MANIFEST_FILES = [
+    'package.json', 'requirements.txt', 'Cargo.toml', 'pom.xml',
+    'go.mod', 'composer.json', 'Pipfile', 'pyproject.toml',
+    'Dockerfile', 'docker-compose.yml', 'docker-compose.yaml', 'compose.yml', 'compose.yaml',
+    'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'poetry.lock', 'Cargo.lock',
+]
+
+# A lockfile restates its manifest's direct dependencies, so techs found in
+# both count once; only transitive finds add weight
+LOCKFILE_MANIFESTS = {
+    'package-lock.json': 'package.json',
+    'npm-shrinkwrap.json': 'package.json',
+    'yarn.lock': 'package.json',
+    'poetry.lock': 'pyproject.toml',
+    'Cargo.lock': 'Cargo.toml',
+}
+
+# Vendored or generated directories whose manifests aren't ours
+SKIPPED_DIRS = {'node_modules', 'vendor', 'bower_components', '.venv', 'venv', 'site-packages', 'third_party'}
+
+# Maximum page size of the REST listing endpoints
+REPOS_PER_PAGE = 100
+
+# Requests get_detailed_repo_metrics() makes per repo (releases, contributors, commits)
+METRICS_CALLS_PER_REPO = 3
+
+# English month abbreviations; strftime('%b') follows the runner's locale
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# README marker names (<!--START_SECTION:name--> ... <!--END_SECTION:name-->)
+TECH_SECTION = 'techstack'
+PROJECTS_SECTION = 'projects'
+
+def manifest_kind(path):
+    """Return the file name analyze_file_content expects for a tree path, or None if it isn't a manifest"""
+    parts = path.split('/')
+    if any(part in SKIPPED_DIRS for part in parts[:-1]):
+        return None
+    name = parts[-1]
+    if name in MANIFEST_FILES:
+        return name
+    # Dockerfile.dev, api.Dockerfile, ...
+    if name.startswith('Dockerfile.') or name.endswith('.Dockerfile'):
+        return 'Dockerfile'
+    return None
+
+def group_manifests(entries):
+    """{manifest kind: [tree entries]} for the manifests among tree entries with a 'path'"""
+    manifests = defaultdict(list)
+    for entry in entries:
+        kind = manifest_kind(entry['path'])
+        if kind:
+            manifests[kind].append(entry)
+    return manifests
+
+def make_session(pool_size=16):
+    """Create a keep-alive session whose connection pool fits `pool_size` workers.
+    
+    Requests get timeouts, retries on 5xx and connection errors, and a circuit
+    breaker (see http_client.py). GraphQL POSTs here are read-only queries, so
+    they are retried too. GITHUB_HEDGE_AFTER=<seconds> hedges slow GETs, at the
+    cost of extra rate-limit budget.
+    """
+    hedge_after = os.getenv('GITHUB_HEDGE_AFTER')
+    return ResilientSession(pool_size, retry_methods=('GET', 'HEAD', 'POST'),
+                            hedge_after=float(hedge_after) if hedge_after else None)
+
 class GitHubRepoAnalyzer:
-    def __init__(self, username, token=None):
+    def __init__(self, username, token=None, cache=None, session=None, max_workers=8, backend='rest', snapshot=None, scheduler=None, metrics=None,
+                 owner_type='users', results=None, ranking_weights=None, recorder=None, replay=None, blobs=None,
+                 parse_pool=None, mirror=None):
         self.username = username
+        self.owner_type = owner_type  # 'users' or 'orgs'
         self.token = token
         self.headers = {'Authorization': f'token {token}'} if token else {}
         self.tech_usage = defaultdict(int)
+        self.cache = cache
+        self.snapshot = snapshot
+        self.blobs = blobs  # Detection results by manifest blob sha
+        self.parse_pool = parse_pool  # Optional process pool for manifest parsing
+        self.scheduler = scheduler or RateLimitScheduler()
+        self.metrics = metrics or RunMetrics()
+        self.max_workers = max_workers
+        self.session = session or make_session(max_workers)
         
-    def get_repositories(self):
-        """Fetch all public repositories"""
-        repos = []
-        page = 1
+        # With the GraphQL backend, get_repositories() prefetches languages
+        # and metrics for every repo; keyed by full name
+        self.graphql = GraphQLSource(self._post, GRAPHQL_URL) if backend == 'graphql' else None
+        self.prefetched = {}
+        # Whether the last listing got every page; a cut-short one must not prune the snapshot
+        self.listing_complete = False
+        # With the clone backend, languages and manifests come from local partial clones
+        self.mirror = mirror or (GitMirror(token=token) if backend == 'clone' else None)
         
-        while True:
-            url = f"https://api.github.com/users/{self.username}/repos?page={page}&per_page=100"
-            response = requests.get(url, headers=self.headers)
+        # Per-repo results keyed by (kind, full name); analyzers for several
+        # accounts share one dict so a repo listed twice is fetched once
+        self.results = results if results is not None else {}
+        self.ranking_weights = ranking_weights or load_weights()
+        
+        # Record every consumed response to an archive, or serve them all from one
+        self.recorder = recorder
+        self.replay = replay
+        # Clock for ranking; a replay pins it to the recording time so output is reproducible
+        self.now = datetime.fromisoformat(replay.recorded_at.replace('Z', '+00:00')) if replay else None
+
+    def repo_path(self, repo):
+        """'owner/name' for API urls; listings of orgs and other users aren't under self.username"""
+        return repo.get('full_name') or f"{self.username}/{repo['name']}"
+
+    def _get(self, url, priority=PRIORITY_NORMAL):
+        """GET a GitHub API url through the rate-limit scheduler and the response cache if enabled.
+        
+        Raises BudgetExhausted when the remaining quota is reserved for higher priority calls.
+        """
+        endpoint = endpoint_name(url)
+        if self.replay:
+            start = time.perf_counter()
+            response = self.replay.response('GET', url)
+            self.metrics.record_request(endpoint, response.status_code, time.perf_counter() - start, 0)
+            return response
+        
+        for attempt in range(3):
+            self.scheduler.acquire(priority, endpoint)
+            start = time.perf_counter()
+            if self.cache:
+                response = self.cache.get(self.session, url, headers=self.headers)
+            else:
+                response = self.session.get(url, headers=self.headers)
             
-            if response.status_code != 200:
-                print(f"Error fetching repos: {response.status_code}")
-                break
-                
-            page_repos = response.json()
-            if not page_repos:
-                break
-                
-            repos.extend(page_repos)
-            page += 1
+            # Responses served from the cache were a body-less 304 on the wire
+            from_cache = getattr(response, 'from_cache', False)
+            self.metrics.record_request(endpoint, 304 if from_cache else response.status_code,
+                                        time.perf_counter() - start, 0 if from_cache else len(response.content),
+                                        retried=attempt > 0)
+            if self.recorder:
+                self.recorder.record('GET', url, response, headers={**self.session.headers, **self.headers})
             
-        return repos
+            # A response served from the cache was a 304, which costs no budget
+            if from_cache or self.scheduler.record(response) is None:
+                return response
+        return response
+
+    def _post(self, url, payload):
+        """POST a GraphQL query through the scheduler; GraphQL responses are not cacheable"""
+        if self.replay:
+            return self.replay.response('POST', url, payload)
+        self.scheduler.acquire(PRIORITY_HIGH, 'graphql')
+        start = time.perf_counter()
+        response = self.session.post(url, json=payload, headers=self.headers)
+        self.metrics.record_request('graphql', response.status_code, time.perf_counter() - start, len(response.content))
+        if self.recorder:
+            self.recorder.record('POST', url, response, headers={**self.session.headers, **self.headers},
+                                 payload=payload)
+        return response
+
+    def record_error(self, where, error):
+        """Count a failure the analysis works around, so the run report shows what was lost"""
+        self.metrics.count(f"errors.{where}.{type(error).__name__}")
     
-    def analyze_package_files(self, repo):
-        """Analyze package files to detect frameworks/libraries"""
-        files_to_check = [
-            'package.json', 'requirements.txt', 'Cargo.toml', 'pom.xml',
-            'go.mod', 'composer.json', 'Pipfile', 'pyproject.toml'
-        ]
+    def get_rate_limit(self):
+        """Current core/graphql budgets; /rate_limit itself doesn't count against the limit"""
+        if self.replay:
+            return {}
+        try:
+            response = self.session.get(f"{API_URL}/rate_limit", headers=self.headers)
+            if response.status_code != 200:
+                return {}
+            resources = response.json().get('resources', {})
+            return {name: resources[name] for name in ('core', 'graphql') if name in resources}
+        except requests.RequestException:
+            return {}
         
-        for file_name in files_to_check:
-            try:
-                url = f"https://api.github.com/repos/{self.username}/{repo['name']}/contents/{file_name}"
-                response = requests.get(url, headers=self.headers)
-                
-                if response.status_code == 200:
-                    content = response.json()
-                    if content['type'] == 'file':
-                        # Decode base64 content
-                        import base64
-                        file_content = base64.b64decode(content['content']).decode('utf-8')
-                        self.analyze_file_content(file_name, file_content)
-                        
-            except Exception as e:
-                continue
+    def get_repositories(self):
+        """Fetch all public repositories"""
+        return list(self.iter_repositories())
     
-    def analyze_file_content(self, filename, content):
-        """Analyze file content for technologies"""
-        content_lower = content.lower()
+    def iter_repositories(self):
+        """Yield public repositories as compact records while their pages arrive.
         
-        if filename == 'package.json':
-            try:
-                data = json.loads(content)
-                deps = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
-                
-                for dep in deps.keys():
-                    if 'react' in dep and 'native' not in dep:
-                        self.tech_usage['React'] += 5
-                    elif 'next' in dep:
-                        self.tech_usage['Next.js'] += 5
-                    elif 'vue' in dep:
-                        self.tech_usage['Vue'] += 5
-                    elif 'angular' in dep:
-                        self.tech_usage['Angular'] += 5
-                    elif 'svelte' in dep:
-                        self.tech_usage['Svelte'] += 5
-                    elif 'express' in dep:
-                        self.tech_usage['Express'] += 5
-                        
-            except json.JSONDecodeError:
-                pass
-                
-        elif filename == 'requirements.txt' or filename == 'pyproject.toml':
-            if 'django' in content_lower:
-                self.tech_usage['Django'] += 5
-            if 'fastapi' in content_lower:
-                self.tech_usage['FastAPI'] += 5
-            if 'flask' in content_lower:
-                self.tech_usage['Flask'] += 5
-            if 'tensorflow' in content_lower:
-                self.tech_usage['TensorFlow'] += 5
-            if 'torch' in content_lower or 'pytorch' in content_lower:
-                self.tech_usage['PyTorch'] += 5
-            if 'transformers' in content_lower:
-                self.tech_usage['Transformers'] += 5
-            if 'openai' in content_lower:
-                self.tech_usage['OpenAI'] += 5
-                
-        elif filename == 'Dockerfile':
-            if 'postgres' in content_lower:
-                self.tech_usage['PostgreSQL'] += 3
-            if 'mongo' in content_lower:
-                self.tech_usage['MongoDB'] += 3
-            if 'redis' in content_lower:
-                self.tech_usage['Redis'] += 3
-            if 'mysql' in content_lower:
-                self.tech_usage['MySQL'] += 3
+        Page 1 comes first; once its Link header gives the last page number,
+        the remaining pages are fetched in parallel and yielded in order, so
+        callers can start analyzing before the listing is complete. A page
+        that fails ends the listing early and leaves listing_complete False.
+        """
+        self.listing_complete = False
+        if self.graphql:
+            yield from self.iter_repositories_graphql()
+            self.listing_complete = True
+            return
+        
+        response = self.fetch_repo_page(1)
+        if response is None:
+            return
+        page_repos = response.json()
+        yield from map(RepoRecord.from_api, page_repos)
+        
+        last = last_page(response.headers.get('Link'))
+        if last is None:
+            # No Link header: a single page, unless it came back full
+            page = 1
+            while len(page_repos) == REPOS_PER_PAGE:
+                page += 1
+                response = self.fetch_repo_page(page)
+                if response is None:
+                    return
+                page_repos = response.json()
+                yield from map(RepoRecord.from_api, page_repos)
+            self.listing_complete = True
+            return
+        
+        with ThreadPoolExecutor(max_workers=max(min(self.max_workers, last - 1), 1)) as pool:
+            for response in pool.map(self.fetch_repo_page, range(2, last + 1)):
+                if response is None:
+                    return
+                yield from map(RepoRecord.from_api, response.json())
+        self.listing_complete = True
     
-    def analyze_repository_languages(self, repos):
-        """Analyze programming languages from GitHub API"""
-        for repo in repos:
-            if repo['fork'] or repo['archived']:
-                continue
-                
+    def fetch_repo_page(self, page):
+        """One page of the account's repository listing, or None on error"""
+        url = f"{API_URL}/{self.owner_type}/{self.username}/repos?page={page}&per_page={REPOS_PER_PAGE}"
+        if self.owner_type == 'orgs':
+            url += "&type=public"
+        response = self._get(url, PRIORITY_HIGH)
+        
+        if response.status_code != 200:
+            print(f"Error fetching repos: {response.status_code}")
+            return None
+        return response
+    
+    def iter_repositories_graphql(self):
+        """Yield all public repositories, prefetching their languages and metrics"""
+        for repo, languages, metrics in self.graphql.fetch_repositories(self.username):
+            self.prefetched[self.repo_path(repo)] = {'languages': languages, 'metrics': metrics}
+            yield RepoRecord.from_api(repo)
+    
+    @property
+    def owner_key(self):
+        return f"{self.owner_type}/{self.username}"
+    
+    def apply_events(self, listing, events):
+        """Patch the repos named in `events` into a stored listing with one GET each.
+        
+        Deleted or now-private repos are dropped, new ones appended and renamed
+        ones re-keyed. Events for other owners' repos are ignored.
+        """
+        repos = {self.repo_path(repo).lower(): repo for repo in listing}
+        names = [name for name in events if name.split('/')[0].lower() == self.username.lower()]
+        for name in sorted(set(events) - set(names)):
+            print(f"  ⏭️  {name}: not owned by {self.username}, ignored")
+        
+        with ThreadPoolExecutor(max_workers=max(min(self.max_workers, len(names)), 1)) as pool:
+            responses = list(pool.map(lambda name: self._get(f"{API_URL}/repos/{name}", PRIORITY_HIGH), names))
+        
+        for name, response in zip(names, responses):
+            if response.status_code == 200 and not response.json().get('private'):
+                repo = RepoRecord.from_api(response.json())
+                # A renamed repo redirects to its new full name
+                repos.pop(name.lower(), None)
+                repos[self.repo_path(repo).lower()] = repo
+                if self.snapshot and events[name] & METRICS_EVENTS:
+                    self.snapshot.forget_metrics(repo)
+                print(f"  🔄 {repo['full_name']}: {', '.join(sorted(events[name]))}")
+            elif response.status_code in (200, 404, 451):
+                repos.pop(name.lower(), None)
+                print(f"  🗑️  {name}: deleted or private, removed")
+            else:
+                print(f"  ⚠️  {name}: HTTP {response.status_code}, keeping the stored record")
+        self.listing_complete = True
+        return list(repos.values())
+    
+    def analyze_package_files(self, repo, usage=None):
+        """Analyze package files to detect frameworks/libraries.
+        
+        Lists the repo tree once and fetches only the manifest blobs that exist,
+        at any depth (monorepos keep them in frontend/, backend/, ...).
+        Returns False if any fetch failed, so the result is not persisted as complete.
+        """
+        if usage is None:
+            usage = self.tech_usage
+        
+        branch = repo.get('default_branch') or 'HEAD'
+        tree_url = f"{API_URL}/repos/{self.repo_path(repo)}/git/trees/{branch}?recursive=1"
+        try:
+            response = self._get(tree_url, PRIORITY_LOW)
+        except BudgetExhausted:
+            raise
+        except Exception as e:
+            self.record_error('trees', e)
+            return False
+        
+        # 409 is returned for empty repositories
+        if response.status_code in (404, 409):
+            return True
+        if response.status_code != 200:
+            return False
+        
+        entries = (entry for entry in response.json().get('tree', []) if entry.get('type') == 'blob')
+        manifests = group_manifests(entries)
+        
+        # Each blob is parsed and dropped as it arrives. One blob listed under
+        # several manifest kinds is fetched once and held only until the last
+        # of them has parsed it (analyze_manifests() dedupes within a kind).
+        pending = Counter(sha for kind_entries in manifests.values()
+                          for sha in {entry['sha'] for entry in kind_entries})
+        held = {}
+        
+        def load(kind, entry):
+            sha = entry['sha']
+            pending[sha] -= 1
+            if sha in held:
+                content = held.pop(sha)
+            else:
+                blob = self._get(f"{API_URL}/repos/{self.repo_path(repo)}/git/blobs/{sha}", PRIORITY_LOW)
+                content = blob.json()['content'] if blob.status_code == 200 else None
+            if pending[sha] > 0:
+                held[sha] = content
+            if content is None:
+                return None
+            return self.parse(detect_encoded, kind, content)
+        
+        return self.analyze_manifests(manifests, load, usage)
+    
+    def analyze_clone(self, repo, languages, techs):
+        """Clone backend: update the repo's local mirror and analyze its tree without API calls.
+        
+        Returns False if a manifest couldn't be read.
+        """
+        git_dir, commit = self.mirror.sync(self.repo_path(repo))
+        if commit is None:
+            return True  # Empty repository
+        files = self.mirror.files(git_dir, commit)
+        self.add_language_weights(self.mirror.language_bytes(files), languages)
+        
+        def load(kind, entry):
+            content = self.mirror.read(git_dir, entry['sha']).decode('utf-8', errors='replace')
+            return self.parse(detect_technologies, kind, content)
+        
+        entries = ({'path': path, 'sha': sha} for path, sha, _ in files)
+        return self.analyze_manifests(group_manifests(entries), load, techs)
+    
+    def parse(self, task, *args):
+        """Run a detection task in the process pool when there is one"""
+        if self.parse_pool:
+            return self.parse_pool.submit(task, *args).result()
+        return task(*args)
+    
+    def analyze_manifests(self, manifests, load, usage):
+        """Add the technologies of {kind: [tree entries]} to `usage`.
+        
+        `load(kind, entry)` returns one blob's {tech: weight}, or None if it
+        couldn't be fetched. Returns False if any blob was missed.
+        """
+        complete = True
+        group_usage = defaultdict(lambda: defaultdict(int))
+        # Results by (kind, sha) for this repo, so repeated blobs are loaded once even without a BlobStore
+        loaded = {}
+        for kind in sorted(manifests, key=lambda k: MANIFEST_FILES.index(k)):
+            # Several copies of one manifest (e.g. a package.json per app) count
+            # once per tech, like a single root manifest would
+            kind_usage = group_usage[LOCKFILE_MANIFESTS.get(kind, kind)]
+            for entry in sorted(manifests[kind], key=lambda e: (e['path'].count('/'), e['path'])):
+                # Identical manifests (shared templates, copies across apps) have the same sha
+                key = (kind, entry['sha'])
+                if key in loaded:
+                    file_usage = loaded[key]
+                else:
+                    file_usage = self.blobs.get(kind, entry['sha']) if self.blobs else None
+                    if file_usage is None:
+                        try:
+                            file_usage = load(kind, entry)
+                        except BudgetExhausted:
+                            raise
+                        except Exception as e:
+                            self.record_error('manifests', e)
+                        if file_usage is not None and self.blobs:
+                            self.blobs.put(kind, entry['sha'], file_usage)
+                    loaded[key] = file_usage
+                if file_usage is None:
+                    complete = False
+                    continue
+                for tech, weight in file_usage.items():
+                    kind_usage[tech] = max(kind_usage[tech], weight)
+            
+        for kind_usage in group_usage.values():
+            for tech, weight in kind_usage.items():
+                usage[tech] += weight
+        return complete
+    
+    def analyze_file_content(self, filename, content, usage=None):
+        """Analyze file content for technologies, adding weights to `usage` (default: tech_usage)"""
+        if usage is None:
+            usage = self.tech_usage
+        for tech, weight in detect_technologies(filename, content).items():
+            usage[tech] += weight
+    
+    def add_language_weights(self, languages, usage):
+        """Add weights for a {language: bytes} map to `usage`"""
+        for lang, bytes_count in languages.items():
+            # Weight by lines of code
+            weight = min(bytes_count // 1000, 10)  # Cap at 10 points per repo
+            usage[lang] += weight
+            
+            # Detect Node.js from JavaScript repos
+            if lang == 'JavaScript':
+                usage['Node.js'] += weight // 2
+
+    def analyze_repo(self, repo):
+        """Analyze a single repository and return its {tech: weight} contribution"""
+        key = ('usage', self.repo_path(repo))
+        if key not in self.results:
+            self.results[key] = self.fetch_repo_usage(repo)
+        return self.results[key]
+
+    def fetch_repo_usage(self, repo):
+        # Unchanged since the last run: reuse the stored contribution
+        if self.snapshot:
+            usage = self.snapshot.contribution(repo)
+            if usage is not None:
+                return usage
+        
+        languages = defaultdict(int)
+        techs = defaultdict(int)
+        complete = True
+        
+        prefetched = self.prefetched.get(self.repo_path(repo))
+        if self.mirror:
+            try:
+                complete = self.analyze_clone(repo, languages, techs)
+            except Exception as e:
+                self.record_error('clones', e)
+                return languages
+        else:
             try:
-                url = f"https://api.github.com/repos/{self.username}/{repo['name']}/languages"
-                response = requests.get(url, headers=self.headers)
+                if prefetched:
+                    self.add_language_weights(prefetched['languages'], languages)
+                else:
+                    url = f"{API_URL}/repos/{self.repo_path(repo)}/languages"
+                    response = self._get(url)
+                    
+                    if response.status_code == 200:
+                        self.add_language_weights(response.json(), languages)
+                    else:
+                        complete = False
                 
-                if response.status_code == 200:
-                    languages = response.json()
-                    for lang, bytes_count in languages.items():
-                        # Weight by lines of code
-                        weight = min(bytes_count // 1000, 10)  # Cap at 10 points per repo
-                        self.tech_usage[lang] += weight
-                        
-                        # Detect Node.js from JavaScript repos
-                        if lang == 'JavaScript':
-                            self.tech_usage['Node.js'] += weight // 2
+                # Analyze package files for this repo; the GraphQL backend
+                # also takes them from the REST tree (see github_graphql.py)
+                complete = self.analyze_package_files(repo, techs) and complete
                             
+            except BudgetExhausted:
+                # Out of quota: last known data beats a half-empty tech stack
+                if self.snapshot:
+                    return self.snapshot.stale_contribution(repo) or languages
+                return languages
             except Exception as e:
-                continue
-                
-            # Analyze package files for this repo
-            self.analyze_package_files(repo)
+                self.record_error('languages', e)
+                return languages
+        
+        # Only persist complete results so failed fetches are retried next run
+        if self.snapshot and complete:
+            self.snapshot.store_contribution(repo, languages, techs)
+        
+        usage = languages
+        for tech, weight in techs.items():
+            usage[tech] += weight
+        return usage
+
+    def analyze_repository_languages(self, repos):
+        """Analyze programming languages from GitHub API; `repos` may be a stream still being fetched"""
+        repos = (repo for repo in repos if not (repo['fork'] or repo['archived']))
+        
+        # Fan out per-repo work; map() yields in input order, so the merge
+        # below is deterministic regardless of completion order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for usage in pool.map(self.metrics.profiled(self.analyze_repo), repos):
+                for tech, weight in usage.items():
+                    self.tech_usage[tech] += weight
     
     def generate_tech_badges(self):
-        """Generate shield badges for detected technologies"""
-        badges = {
-            'languages': [],
-            'frontend': [],
-            'backend': [],
-            'ai_ml': [],
-            'databases': [],
-            'cloud_devops': []
-        }
+        """Group detected technologies by badge category, most used first"""
+        badges = {category: [] for category, _, _ in TECH_CATEGORIES}
         
-        # Sort by usage count
-        sorted_tech = sorted(self.tech_usage.items(), key=lambda x: x[1], reverse=True)
+        # Sort by usage count; equal counts by name so ties don't follow API order
+        sorted_tech = sorted(self.tech_usage.items(), key=lambda x: (-x[1], x[0]))
         
         for tech, count in sorted_tech:
             if count < 2:  # Only include tech with significant usage
                 continue
-                
+            
             if tech in TECH_MAPPING:
-                badge = TECH_MAPPING[tech]
-                
-                # Categorize
-                if tech in ['Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'Rust', 'C++', 'C', 'PHP', 'Ruby', 'Swift', 'Kotlin', 'Dart', 'Shell']:
-                    badges['languages'].append(badge)
-                elif tech in ['React', 'Next.js', 'Vue', 'Angular', 'Svelte']:
-                    badges['frontend'].append(badge)
-                elif tech in ['Django', 'FastAPI', 'Flask', 'Express', 'Node.js', 'Spring']:
-                    badges['backend'].append(badge)
-                elif tech in ['TensorFlow', 'PyTorch', 'OpenAI', 'Transformers']:
-                    badges['ai_ml'].append(badge)
-                elif tech in ['PostgreSQL', 'MongoDB', 'Redis', 'MySQL', 'SQLite']:
-                    badges['databases'].append(badge)
-                elif tech in ['Docker', 'Kubernetes', 'AWS', 'GCP', 'Azure']:
-                    badges['cloud_devops'].append(badge)
+                for category, _, members in TECH_CATEGORIES:
+                    if tech in members:
+                        badges[category].append(tech)
+                        break
         
         return badges
     
     def get_detailed_repo_metrics(self, repo):
         """Get detailed metrics for a repository including contributions and releases"""
+        key = ('metrics', self.repo_path(repo))
+        if key not in self.results:
+            self.results[key] = self.fetch_repo_metrics(repo)
+        return dict(self.results[key])
+
+    def fetch_repo_metrics(self, repo):
         metrics = {
-            'releases': [],
+            'releases_count': 0,
             'contributors_count': 0,
             'commits_count': 0,
             'issues_count': repo.get('open_issues_count', 0),
@@ -244,228 +619,255 @@ class GitHubRepoAnalyzer:
         if repo['stargazers_count'] == 0 and repo.get('forks_count', 0) == 0:
             return metrics
         
+        prefetched = self.prefetched.get(self.repo_path(repo))
+        if prefetched:
+            metrics.update(prefetched['metrics'])
+            # GraphQL has no contributors connection (see github_graphql.py)
+            contributors = self.get_contributors_count(repo)
+            if contributors is not None:
+                metrics['contributors_count'] = contributors
+            return metrics
+        
+        if self.snapshot:
+            stored = self.snapshot.metrics(repo)
+            if stored is not None:
+                metrics.update(stored)
+                return metrics
+        
+        base_url = f"{API_URL}/repos/{self.repo_path(repo)}"
+        complete = True
+        requests = 0
         try:
-            # Get releases information (limit to first page)
-            releases_url = f"https://api.github.com/repos/{self.username}/{repo['name']}/releases?per_page=5"
-            releases_response = requests.get(releases_url, headers=self.headers)
-            if releases_response.status_code == 200:
-                releases = releases_response.json()
-                metrics['releases'] = releases
-                if releases:
-                    metrics['latest_release'] = releases[0]
-        except:
-            pass
+            # Releases: count from one-item pages; the newest release is also
+            # the latest one unless it is a draft or prerelease
+            counted = self.count_items(f"{base_url}/releases?per_page=1")
+            requests += 1
+            if counted is None:
+                complete = False
+            else:
+                metrics['releases_count'], newest = counted
+                if newest and not (newest.get('draft') or newest.get('prerelease')):
+                    metrics['latest_release'] = trim_release(newest)
+                elif newest:
+                    latest_response = self._get(f"{base_url}/releases/latest", PRIORITY_HIGH)
+                    requests += 1
+                    if latest_response.status_code == 200:
+                        metrics['latest_release'] = trim_release(latest_response.json())
+                    elif latest_response.status_code != 404:
+                        complete = False
             
-        try:
-            # Get contributors count (limit to first page for performance)
-            contributors_url = f"https://api.github.com/repos/{self.username}/{repo['name']}/contributors?per_page=100"
-            contributors_response = requests.get(contributors_url, headers=self.headers)
-            if contributors_response.status_code == 200:
-                contributors = contributors_response.json()
-                metrics['contributors_count'] = len(contributors)
-                
-                # Approximate commits count from contributors data
-                total_contributions = sum(c.get('contributions', 0) for c in contributors)
-                metrics['commits_count'] = total_contributions
-        except:
-            pass
+            # Exact contributor and commit totals; ranking has usually fetched the contributors already
+            contributors = self.get_contributors_count(repo)
+            if contributors is None:
+                complete = False
+            else:
+                metrics['contributors_count'] = contributors
+            
+            counted = self.count_items(f"{base_url}/commits?per_page=1")
+            requests += 1
+            if counted is None:
+                complete = False
+            else:
+                metrics['commits_count'] = counted[0]
+        except BudgetExhausted:
+            return self.stale_metrics(repo, metrics)
+        except Exception as e:
+            self.record_error('metrics', e)
+            complete = False
+        finally:
+            self.metrics.count('ranking_details_fetched', requests)
+        
+        if self.snapshot and complete:
+            self.snapshot.store_metrics(repo, metrics)
             
         return metrics
 
-    def clean_duplicated_sections(self, content):
-        """Clean up duplicated sections in the README"""
-        import re
-        
-        # Remove duplicate tech stack sections (keep only the first complete one)
-        tech_duplicates = r'(## 🔥 Languages.*?(?=## |---|\Z))'
-        matches = re.findall(tech_duplicates, content, flags=re.DOTALL)
-        if len(matches) > 1:
-            # Keep only the last/most complete version
-            for match in matches[:-1]:
-                content = content.replace(match, '', 1)
+    def get_contributors_count(self, repo):
+        """Exact contributor total (anonymous ones included), or None if it couldn't be fetched.
         
-        # Remove duplicate featured projects sections
-        project_duplicates = r'(## \d+\. \[.*?\]\(https://github\.com/.*?\).*?(?=## \d+\.|\n---\n|\Z))'
-        matches = re.findall(project_duplicates, content, flags=re.DOTALL)
-        if len(matches) > 5:  # If more than 5 projects, we have duplicates
-            # Remove duplicates (keep first 5)
-            for match in matches[5:]:
-                content = content.replace(match, '', 1)
-        
-        # Clean up multiple consecutive newlines
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        get_popular_repos() asks for it before the other detail metrics to
+        tighten a repo's bound; fetch_repo_metrics() then reuses it.
+        """
+        key = ('contributors', self.repo_path(repo))
+        if key not in self.results:
+            self.results[key] = self.fetch_contributors_count(repo)
+        return self.results[key]
+
+    def fetch_contributors_count(self, repo):
+        if self.snapshot and self.repo_path(repo) not in self.prefetched:
+            stored = self.snapshot.metrics(repo)
+            if stored is not None:
+                return stored['contributors_count']
+        try:
+            counted = self.count_items(f"{API_URL}/repos/{self.repo_path(repo)}/contributors?per_page=1&anon=1")
+        except BudgetExhausted:
+            stored = self.snapshot.stale_metrics(repo) if self.snapshot else None
+            return stored['contributors_count'] if stored else None
+        except Exception as e:
+            self.record_error('metrics', e)
+            return None
+        finally:
+            self.metrics.count('ranking_details_fetched')
+        return counted[0] if counted else None
+
+    def count_items(self, url):
+        """Total item count of a paginated listing requested with per_page=1, and its first item.
         
-        return content
+        With one item per page the rel="last" page number is the total, so
+        one small response replaces downloading every page. Returns None on error.
+        """
+        response = self._get(url, PRIORITY_HIGH)
+        # 204 (contributors) and 409 (commits) are returned for empty repositories
+        if response.status_code in (204, 409):
+            return 0, None
+        if response.status_code != 200:
+            return None
+        items = response.json()
+        first = items[0] if items else None
+        return last_page(response.headers.get('Link')) or len(items), first
+
+    def stale_metrics(self, repo, metrics):
+        """Fall back to the last stored metrics for `repo` when the API budget ran out"""
+        stored = self.snapshot.stale_metrics(repo) if self.snapshot else None
+        if stored is not None:
+            metrics.update(stored)
+        return metrics
 
     def get_popular_repos(self, repos, limit=5):
-        """Get popular repositories with enhanced metrics and better ranking"""
-        popular_repos = []
+        """Get popular repositories with enhanced metrics and better ranking.
+        
+        Candidates are visited best upper bound first (listing score plus the
+        most the detail terms could add), a batch at a time, and only while
+        some remaining bound can still enter the top `limit`, which a min-heap
+        of exact scores keeps track of. A repo's first visit fetches only its
+        contributor count and re-queues it with the tighter bound; the second
+        fetches the rest of its detailed metrics.
+        """
+        weights = self.ranking_weights
+        now = self.now or datetime.now(timezone.utc)
         
         # Hardcoded filter for specific repos to exclude
         excluded_repos = ['esaySample']
         
-        for repo in repos:
-            if repo['fork'] or repo['archived'] or repo['private']:
-                continue
-                
-            # Skip excluded repositories
-            if repo['name'] in excluded_repos:
-                continue
-                
-            # Get detailed metrics
-            metrics = self.get_detailed_repo_metrics(repo)
-            
-            # Enhanced scoring algorithm
-            score = 0
-            
-            # Base scores
-            score += repo['stargazers_count'] * 3  # Stars are important
-            score += metrics['forks'] * 2  # Forks indicate usefulness
-            score += metrics['watchers'] * 1  # Watchers show interest
-            score += metrics['contributors_count'] * 5  # Multiple contributors = active project
-            
-            # Release scoring
-            if metrics['releases']:
-                score += len(metrics['releases']) * 4  # Each release adds value
-                # Bonus for recent releases
-                if metrics['latest_release']:
-                    try:
-                        from datetime import datetime, timezone
-                        release_date = datetime.fromisoformat(metrics['latest_release']['published_at'].replace('Z', '+00:00'))
-                        days_since_release = (datetime.now(timezone.utc) - release_date).days
-                        if days_since_release < 90:  # Recent release
-                            score += 10
-                        elif days_since_release < 365:  # Somewhat recent
-                            score += 5
-                    except:
-                        pass
-            
-            # Activity bonus
-            from datetime import datetime, timezone
-            updated = datetime.fromisoformat(repo['updated_at'].replace('Z', '+00:00'))
-            days_old = (datetime.now(timezone.utc) - updated).days
-            if days_old < 30:
-                score += 8  # Very active
-            elif days_old < 90:
-                score += 5  # Recently active
-            elif days_old < 365:
-                score += 2  # Moderately active
-            
-            # Project maturity bonus
-            if metrics['commits_count'] > 100:
-                score += 5
-            if metrics['commits_count'] > 500:
-                score += 5
-                
-            # Website/documentation bonus
-            if repo['homepage']:
-                score += 8
-                
-            # Size consideration (not too small, not too large)
-            if 100 < metrics['size_kb'] < 50000:  # Sweet spot for project size
-                score += 3
-                
-            # Language popularity bonus (for commonly used languages)
-            popular_languages = ['Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'Rust']
-            if repo.get('language') in popular_languages:
-                score += 2
+        # Canonical order (most stars, then name) so score ties don't depend on listing order
+        candidates = sorted(
+            (repo for repo in repos
+             if not (repo['fork'] or repo['archived'] or repo['private'])
+             and repo['name'] not in excluded_repos),
+            key=lambda repo: (-repo['stargazers_count'], self.repo_path(repo).lower()),
+        )
+        if limit <= 0:
+            return []
+        
+        # Repos without stars or forks skip the detail fetch (see fetch_repo_metrics), so their bound is exact
+        detailed = [bool(repo['stargazers_count'] or repo.get('forks_count', 0)) for repo in candidates]
+        base_scores = [listing_score(repo, weights, now) for repo in candidates]
+        # Max-heap of (-upper bound, index); ties go to the earlier repo in canonical order
+        pending = [(-(base + (detail_bound(weights) if has_details else 0)), i)
+                   for i, (base, has_details) in enumerate(zip(base_scores, detailed))]
+        heapq.heapify(pending)
+        refined = set()  # Candidates whose bound already uses their contributor count
+        
+        def visit(i):
+            if detailed[i] and i not in refined:
+                return 'contributors', self.get_contributors_count(candidates[i])
+            return 'metrics', self.get_detailed_repo_metrics(candidates[i])
+        
+        top = []  # Min-heap of (score, -index, index, metrics)
+        visit = self.metrics.profiled(visit)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending:
+                batch = []
+                while pending and len(batch) < self.max_workers:
+                    upper, i = -pending[0][0], pending[0][1]
+                    if upper <= weights['min_score'] or (len(top) == limit and (upper, -i) < top[0][:2]):
+                        break
+                    heapq.heappop(pending)
+                    batch.append(i)
+                if not batch:
+                    break
                 
-            if score > 5:  # Only include projects with meaningful activity
-                popular_repos.append({
-                    'name': repo['name'],
-                    'description': repo['description'] or 'No description available',
-                    'stars': repo['stargazers_count'],
-                    'forks': metrics['forks'],
-                    'watchers': metrics['watchers'],
-                    'language': repo['language'],
-                    'url': repo['html_url'],
-                    'homepage': repo['homepage'],
-                    'contributors_count': metrics['contributors_count'],
-                    'releases_count': len(metrics['releases']),
-                    'latest_release': metrics['latest_release'],
-                    'commits_count': metrics['commits_count'],
-                    'issues_count': metrics['issues_count'],
-                    'size_kb': metrics['size_kb'],
-                    'last_updated': repo['updated_at'],
-                    'created_at': repo['created_at'],
-                    'score': score
-                })
-        
-        # Sort by score and return top repos
-        return sorted(popular_repos, key=lambda x: x['score'], reverse=True)[:limit]
-
-    def update_readme(self, badges, popular_repos):
-        """Update README with detected tech stack and popular repos"""
-        readme_path = 'README.md'
+                for i, (kind, result) in zip(batch, pool.map(visit, batch)):
+                    if kind == 'contributors':
+                        refined.add(i)
+                        heapq.heappush(pending, (-(base_scores[i] + detail_bound(weights, result)), i))
+                        continue
+                    metrics = result
+                    score = base_scores[i] + detail_score(metrics, weights, now)
+                    if score <= weights['min_score']:  # Only include projects with meaningful activity
+                        continue
+                    entry = (score, -i, i, metrics)
+                    if len(top) < limit:
+                        heapq.heappush(top, entry)
+                    elif entry[:2] > top[0][:2]:
+                        heapq.heapreplace(top, entry)
+        self.metrics.count('ranking_candidates', len(candidates))
         
-        try:
-            with open(readme_path, 'r') as f:
-                content = f.read()
-        except FileNotFoundError:
-            print("README.md not found")
-            return
+        popular_repos = []
+        for score, _, i, metrics in sorted(top, key=lambda entry: entry[:2], reverse=True):
+            repo = candidates[i]
+            popular_repos.append({
+                'name': repo['name'],
+                'description': repo['description'] or 'No description available',
+                'stars': repo['stargazers_count'],
+                'forks': metrics['forks'],
+                'watchers': metrics['watchers'],
+                'language': repo['language'],
+                'url': repo['html_url'],
+                'homepage': repo['homepage'],
+                'contributors_count': metrics['contributors_count'],
+                'releases_count': metrics['releases_count'],
+                'latest_release': metrics['latest_release'],
+                'commits_count': metrics['commits_count'],
+                'issues_count': metrics['issues_count'],
+                'size_kb': metrics['size_kb'],
+                # pushed_at, unlike updated_at, doesn't move when the repo is starred
+                'last_updated': repo['pushed_at'] or repo['updated_at'],
+                'created_at': repo['created_at'],
+                'score': score
+            })
+        return popular_repos
+
+    def readme_sections(self, badges, popular_repos, badge_set=None):
+        """Render the tech stack and featured projects README sections.
         
+        With a BadgeSet, each category and each project's stats are one local
+        SVG instead of a row of img.shields.io images.
+        """
         # Build tech stack section
         tech_section = "\n## 🛠️ Technology Stack\n\n"
         tech_section += "*🔄 Automatically updated based on repository analysis*\n\n"
         tech_section += "<!-- This section is auto-generated by analyzing all repositories -->\n"
         
-        if badges['languages']:
-            tech_section += "### 🔥 Languages\n"
-            tech_section += "\n".join(badges['languages']) + "\n\n"
-            
-        if badges['frontend']:
-            tech_section += "### ⚡ Frontend\n"
-            tech_section += "\n".join(badges['frontend']) + "\n\n"
-            
-        if badges['backend']:
-            tech_section += "### 🔧 Backend\n"
-            tech_section += "\n".join(badges['backend']) + "\n\n"
-            
-        if badges['ai_ml']:
-            tech_section += "### 🤖 AI/ML\n"
-            tech_section += "\n".join(badges['ai_ml']) + "\n\n"
-            
-        if badges['databases']:
-            tech_section += "### 🗄️ Databases\n"
-            tech_section += "\n".join(badges['databases']) + "\n\n"
-            
-        if badges['cloud_devops']:
-            tech_section += "### ☁️ Cloud & DevOps\n"
-            tech_section += "\n".join(badges['cloud_devops']) + "\n\n"
+        for category, title, _ in TECH_CATEGORIES:
+            if not badges[category]:
+                continue
+            tech_section += f"### {title}\n"
+            if badge_set:
+                shields = [parse_shield(TECH_MAPPING[tech]) for tech in badges[category]]
+                alt = " · ".join(alt for alt, _, _ in shields)
+                path = badge_set.write(category, [('', message, color) for _, message, color in shields],
+                                       'for-the-badge', alt)
+                tech_section += f"![{alt}]({path})\n\n"
+            else:
+                tech_section += "\n".join(TECH_MAPPING[tech] for tech in badges[category]) + "\n\n"
         
         # Build enhanced popular repos section with detailed metrics
         popular_section = "\n## 🌟 Featured Projects\n\n"
         popular_section += "*🔄 Automatically ranked by contributions, releases, stars, and activity*\n\n"
         
         for i, repo in enumerate(popular_repos, 1):
-            # Enhanced badges with more metrics
-            badges = []
-            
-            # Language badge
-            if repo['language']:
-                badges.append(f"![{repo['language']}](https://img.shields.io/badge/-{repo['language']}-blue?style=flat-square)")
-            
-            # Stars badge
-            if repo['stars'] > 0:
-                badges.append(f"![Stars](https://img.shields.io/badge/⭐-{repo['stars']}-yellow?style=flat-square)")
-            
-            # Forks badge
-            if repo['forks'] > 0:
-                badges.append(f"![Forks](https://img.shields.io/badge/🔀-{repo['forks']}-green?style=flat-square)")
-            
-            # Contributors badge
-            if repo['contributors_count'] > 1:
-                badges.append(f"![Contributors](https://img.shields.io/badge/👥-{repo['contributors_count']}-purple?style=flat-square)")
-            
-            # Releases badge
-            if repo['releases_count'] > 0:
-                badges.append(f"![Releases](https://img.shields.io/badge/🚀-{repo['releases_count']}_releases-orange?style=flat-square)")
-            
-            # Commits badge (if available)
-            if repo['commits_count'] > 0:
-                commits_display = f"{repo['commits_count']}+" if repo['commits_count'] > 100 else str(repo['commits_count'])
-                badges.append(f"![Commits](https://img.shields.io/badge/📝-{commits_display}_commits-lightgrey?style=flat-square)")
+            # Enhanced badges with more metrics: (alt, label, message, color)
+            stats = project_stats(repo)
+            if badge_set and stats:
+                alt = " · ".join(f"{label} {message}".strip() for _, label, message, _ in stats)
+                path = badge_set.write(f"project-{badge_name(repo['name'])}",
+                                       [(label, message, color) for _, label, message, color in stats],
+                                       'flat-square', alt)
+                badges = [f"![{alt}]({path})"]
+            else:
+                badges = [f"![{alt}](https://img.shields.io/badge/{label}-{message.replace(' ', '_')}-{color}?style=flat-square)"
+                          for alt, label, message, color in stats]
             
             popular_section += f"### {i}. [{repo['name']}]({repo['url']})\n"
             popular_section += f"{repo['description']}\n\n"
@@ -480,12 +882,10 @@ class GitHubRepoAnalyzer:
             # Latest release info
             if repo['latest_release']:
                 release_name = repo['latest_release'].get('tag_name', 'Unknown')
-                try:
-                    from datetime import datetime
-                    release_date = datetime.fromisoformat(repo['latest_release']['published_at'].replace('Z', '+00:00'))
-                    formatted_date = release_date.strftime("%b %Y")
+                formatted_date = month_year(repo['latest_release'].get('published_at'))
+                if formatted_date:
                     project_info.append(f"📦 **Latest Release:** [{release_name}]({repo['latest_release']['html_url']}) ({formatted_date})")
-                except:
+                else:
                     project_info.append(f"📦 **Latest Release:** [{release_name}]({repo['latest_release']['html_url']})")
             
             # Live demo link
@@ -493,13 +893,9 @@ class GitHubRepoAnalyzer:
                 project_info.append(f"🌐 **Live Demo:** [{repo['homepage']}]({repo['homepage']})")
             
             # Project activity
-            try:
-                from datetime import datetime
-                updated = datetime.fromisoformat(repo['last_updated'].replace('Z', '+00:00'))
-                formatted_update = updated.strftime("%b %Y")
+            formatted_update = month_year(repo['last_updated'])
+            if formatted_update:
                 project_info.append(f"🔄 **Last Updated:** {formatted_update}")
-            except:
-                pass
             
             # Add project info
             if project_info:
@@ -507,65 +903,325 @@ class GitHubRepoAnalyzer:
             
             popular_section += "\n"
         
-        # Replace sections using regex
-        import re
-        
-        # Clean up any existing duplicated content first
-        content = self.clean_duplicated_sections(content)
+        return {
+            TECH_SECTION: tech_section.strip(),
+            PROJECTS_SECTION: popular_section.strip(),
+        }
+
+    def update_readme(self, badges, popular_repos):
+        """Update README with detected tech stack and popular repos"""
+        try:
+            update_sections(self.readme_sections(badges, popular_repos), README_PATH, insert_missing=insert_sections)
+        except FileNotFoundError:
+            print("README.md not found")
+            return
         
-        # Replace tech stack section with more precise pattern
+        print("✅ README updated with tech stack and featured projects!")
+
+def month_year(timestamp):
+    """'2024-06-01T12:00:00Z' -> 'Jun 2024' whatever the locale, or None if unparseable"""
+    try:
+        date = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    return f"{MONTHS[date.month - 1]} {date.year}"
+
+
+def project_stats(repo):
+    """Stat badges of a featured project as (alt, label, message, color)"""
+    stats = []
+    if repo['language']:
+        stats.append((repo['language'], '', repo['language'], 'blue'))
+    if repo['stars'] > 0:
+        stats.append(('Stars', '⭐', str(repo['stars']), 'yellow'))
+    if repo['forks'] > 0:
+        stats.append(('Forks', '🔀', str(repo['forks']), 'green'))
+    if repo['contributors_count'] > 1:
+        stats.append(('Contributors', '👥', str(repo['contributors_count']), 'purple'))
+    if repo['releases_count'] > 0:
+        stats.append(('Releases', '🚀', f"{repo['releases_count']} releases", 'orange'))
+    if repo['commits_count'] > 0:
+        stats.append(('Commits', '📝', f"{repo['commits_count']} commits", 'lightgrey'))
+    return stats
+
+
+def badge_name(name):
+    """File-name-safe form of a repo name"""
+    return re.sub(r'[^A-Za-z0-9._-]+', '-', name).strip('-.') or 'repo'
+
+
+def insert_sections(content, sections):
+    """Add marker-wrapped sections to a README that does not have their markers yet.
+
+    Heading-delimited sections left by older versions of this script are
+    replaced in place; later runs then go through render_sections only.
+    """
+    if TECH_SECTION in sections:
+        wrapped = wrap_section(TECH_SECTION, sections[TECH_SECTION])
         tech_pattern = r'## 🛠️ Technology Stack.*?(?=\n---|\n## (?!🛠️)|\Z)'
         if re.search(tech_pattern, content, flags=re.DOTALL):
-            new_content = re.sub(tech_pattern, tech_section.rstrip(), content, flags=re.DOTALL)
+            content = re.sub(tech_pattern, lambda m: wrapped + "\n", content, count=1, flags=re.DOTALL)
         else:
             # Insert after About Me section (after first ---)
-            about_pattern = r'(---\n\n)'
-            new_content = re.sub(about_pattern, f'\\1{tech_section}', content, count=1)
-        
-        # Replace or add popular repos section with precise pattern  
+            content = re.sub(r'(---\n\n)', lambda m: f"{m.group(1)}{wrapped}\n\n---\n\n", content, count=1)
+
+    if PROJECTS_SECTION in sections:
+        wrapped = wrap_section(PROJECTS_SECTION, sections[PROJECTS_SECTION])
         popular_pattern = r'## 🌟 Featured Projects.*?(?=\n---|\n## (?!🌟)|\Z)'
-        if re.search(popular_pattern, new_content, flags=re.DOTALL):
-            new_content = re.sub(popular_pattern, popular_section.rstrip(), new_content, flags=re.DOTALL)
-        else:
+        if re.search(popular_pattern, content, flags=re.DOTALL):
+            content = re.sub(popular_pattern, lambda m: wrapped + "\n", content, count=1, flags=re.DOTALL)
+        elif '## 📊 GitHub Analytics' in content:
             # Insert before GitHub Analytics section
-            analytics_pattern = r'(## 📊 GitHub Analytics)'
-            if re.search(analytics_pattern, new_content):
-                new_content = re.sub(analytics_pattern, f'{popular_section}---\n\n\\1', new_content)
-            else:
-                # If no analytics section, append before the end
-                new_content = new_content.rstrip() + f'\n\n{popular_section}---\n'
-        
-        with open(readme_path, 'w') as f:
-            f.write(new_content)
-        
-        print("✅ README updated with tech stack and featured projects!")
+            content = content.replace('## 📊 GitHub Analytics', f"{wrapped}\n\n---\n\n## 📊 GitHub Analytics", 1)
+        else:
+            # If no analytics section, append before the end
+            content = content.rstrip() + f"\n\n{wrapped}\n\n---\n"
 
-def main():
+    return content
+
+
+def add_arguments(parser):
+    parser.add_argument('--backend', choices=['rest', 'graphql', 'clone'], default='rest',
+                        help="Data source: per-repo REST calls, batched GraphQL queries for languages and metrics "
+                             "(a few requests per 25 repos; manifests still come from the REST tree), "
+                             "or local partial clones for languages and manifests (see git_mirror.py)")
+    parser.add_argument('--full', action='store_true',
+                        help="Ignore the per-repo snapshot and re-analyze every repository")
+    parser.add_argument('--report', default='reports/run-report.json',
+                        help="Where to write the JSON run report")
+    parser.add_argument('--profile', action='store_true',
+                        help="Run language analysis and ranking under cProfile (stats go to reports/profile/)")
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument('--record', metavar='PATH',
+                         help="Write every API response of this run to a gzip JSONL archive (implies --full)")
+    archive.add_argument('--replay', metavar='PATH',
+                         help="Serve all API calls from an archive written by --record; no network or token needed")
+    parser.add_argument('--ranking-weights', metavar='PATH',
+                        help="JSON file overriding featured-project scoring weights (see ranking.DEFAULT_WEIGHTS)")
+    parser.add_argument('--badges', choices=['svg', 'shields'], default='svg',
+                        help="Render badges as local SVGs under --badge-dir, or link img.shields.io images")
+    parser.add_argument('--badge-dir', default=str(DEFAULT_BADGE_DIR),
+                        help="Where --badges svg writes its SVGs (relative to the README)")
+    parser.add_argument('--check', action='store_true',
+                        help="Write nothing; exit with status 1 if README.md or the badge SVGs would change")
+    parser.add_argument('--diff', action='store_true',
+                        help="Like --check, and print a unified diff of README.md")
+    parser.add_argument('--event', metavar='PATH',
+                        help="Dispatch or webhook payload naming changed repos; re-analyze only those "
+                             "(see repo_events.py). Falls back to a full sweep without a stored listing")
+    shard = parser.add_mutually_exclusive_group()
+    shard.add_argument('--shard', type=parse_shard, metavar='K/N',
+                       help="Analyze only the repos whose name hashes to shard K of N (0-based) and write a "
+                            "partial result instead of the README (see shards.py)")
+    shard.add_argument('--repo-range', type=parse_range, metavar='FROM:TO',
+                       help="Analyze only the repos named FROM <= name < TO and write a partial result")
+    shard.add_argument('--merge', nargs='+', metavar='PARTIAL',
+                       help="Render the README from the partial results of every shard; makes no API calls")
+    parser.add_argument('--partial', metavar='PATH',
+                        help="Where a shard writes its partial result (default: reports/partials/<shard>.json)")
+
+
+def open_sources(args):
+    """Cache, snapshot, blob store, recorder and replayer for a run.
+    
+    A replay uses no local state at all, and a recording skips everything
+    that would keep a response out of the archive.
+    """
+    if args.replay:
+        replay = ArchiveReplayer(args.replay, API_URL)
+        print(f"⏪ Replaying {len(replay.entries)} responses recorded at {replay.recorded_at}")
+        return None, None, None, None, replay
+    
+    cache = None if os.getenv('GITHUB_API_CACHE') == 'off' else ResponseCache()
+    snapshot = SnapshotStore()
+    # A recording must contain every response, so nothing is served from the snapshot
+    if args.full or args.record:
+        snapshot.records = {}
+        snapshot.listings = {}
+    blobs = None if args.record else BlobStore()
+    recorder = None
+    if args.record:
+        Path(args.record).parent.mkdir(parents=True, exist_ok=True)
+        recorder = ArchiveRecorder(args.record, API_URL)
+    return cache, snapshot, blobs, recorder, None
+
+
+def close_sources(args, snapshot, blobs, recorder, replay):
+    if snapshot:
+        print(f"♻️  Snapshot: reused {snapshot.stats['reused']} repos, re-analyzed {snapshot.stats['refreshed']}")
+        snapshot.save()
+    if blobs:
+        print(f"🧬 Manifest blobs: {blobs.summary()}")
+        blobs.save()
+    if recorder:
+        recorder.close()
+        print(f"⏺️  Recorded {recorder.count} responses to {args.record}")
+    if replay and replay.misses:
+        print(f"⚠️  {replay.misses} requests were not in the archive and were answered with 404")
+
+
+def make_parse_pool():
+    """Process pool for decoding and parsing manifests, or None to parse in the fetching thread.
+    
+    Off by default (ANALYZER_PARSE_PROCESSES=N turns it on): runs are paced
+    by API requests, and a pool of 4 measured no faster than none while
+    pickling every blob to a worker.
+    """
+    workers = int(os.getenv('ANALYZER_PARSE_PROCESSES', '1'))
+    if workers <= 1:
+        return None
+    # Workers start on demand; spawn keeps them from forking the threaded fetcher
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def report_http(session, metrics):
+    """Print and record transport retries/failures and the errors the analysis worked around"""
+    if session.stats.keys() - {'requests'}:
+        print(f"🌐 HTTP: {session.summary()}")
+    errors = {key[len('errors.'):]: count for key, count in sorted(metrics.counters.items()) if key.startswith('errors.')}
+    if errors:
+        print(f"⚠️  Failures worked around: {', '.join(f'{key} x{count}' for key, count in errors.items())}")
+    metrics.extra['http'] = dict(session.stats)
+
+
+def archive_report(args, recorder, replay):
+    if recorder:
+        return {'archive': {'recorded': args.record, 'responses': recorder.count}}
+    if replay:
+        return {'archive': {'replayed': args.replay, 'misses': replay.misses}}
+    return {}
+
+
+def event_repositories(args, analyzer):
+    """The stored listing patched with the repos named in the --event payload, or None for a full sweep"""
+    events = load_events(args.event)
+    listing = analyzer.snapshot.listing(analyzer.owner_key) if analyzer.snapshot else None
+    if not events:
+        print("📨 Event names no repositories; running a full sweep")
+        return None
+    if listing is None:
+        print("📨 No stored listing to patch; running a full sweep")
+        return None
+    print(f"📨 Event update for {len(events)} repositories")
+    with analyzer.metrics.phase('repo_fetch'):
+        repos = analyzer.apply_events(listing, events)
+    analyzer.metrics.extra['event'] = {name: sorted(types) for name, types in events.items()}
+    return repos
+
+
+def render_sections(args, analyzer, badges, popular_repos):
+    """The README sections, writing badge SVGs unless --badges shields or a dry run"""
+    badge_set = BadgeSet(args.badge_dir, dry_run=args.check or args.diff) if args.badges == 'svg' else None
+    with analyzer.metrics.phase('badge_rendering'):
+        sections = analyzer.readme_sections(badges, popular_repos, badge_set)
+        if badge_set:
+            badge_set.finish()
+            print(f"🖼️  Badge SVGs: {badge_set.summary()}")
+    analyzer.metrics.extra['badges'] = dict(badge_set.stats) if badge_set else None
+    return sections
+
+
+def merge_sections(args, metrics):
+    """--merge: the README sections for the combined partial results of all shards"""
+    try:
+        merged = merge_partials(args.merge)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Can't merge partial results: {e}")
+        return None
+    owner_type, login = merged['account'].split('/', 1)
+    analyzer = GitHubRepoAnalyzer(login, owner_type=owner_type, metrics=metrics)
+    analyzer.tech_usage.update(merged['tech_usage'])
+    print(f"🧩 Merged shards {', '.join(merged['shards'])}: {merged['repos']} repositories, "
+          f"{len(analyzer.tech_usage)} technologies, {len(merged['featured'])} featured projects")
+    
+    with metrics.phase('badge_generation'):
+        badges = analyzer.generate_tech_badges()
+    sections = render_sections(args, analyzer, badges, merged['featured'])
+    metrics.extra.update({
+        'mode': 'merge',
+        'shards': merged['shards'],
+        'repos': merged['repos'],
+        'technologies': len(analyzer.tech_usage),
+        'featured': [repo['name'] for repo in merged['featured']],
+    })
+    return sections
+
+
+def run_analysis(args, metrics):
+    """Analyze the account and return its rendered README sections, or None if it can't run.
+    
+    A shard run writes its partial result and returns None as well.
+    """
+    if args.merge:
+        return merge_sections(args, metrics)
+    
     username = "musiliandrew"  # Your GitHub username
     token = os.getenv('GITHUB_TOKEN')  # GitHub token from environment
     
-    if not token:
+    if not token and not args.replay:
         print("❌ No GITHUB_TOKEN found!")
-        return
+        return None
+    if args.backend == 'clone' and (args.record or args.replay):
+        print("❌ --record and --replay archive API responses; the clone backend reads git mirrors instead")
+        return None
+    
+    workers = int(os.getenv('ANALYZER_WORKERS', '8'))
+    cache, snapshot, blobs, recorder, replay = open_sources(args)
+    parse_pool = make_parse_pool()
+    analyzer = GitHubRepoAnalyzer(username, token, cache=cache, max_workers=workers, backend=args.backend,
+                                  snapshot=snapshot, metrics=metrics,
+                                  ranking_weights=load_weights(args.ranking_weights),
+                                  recorder=recorder, replay=replay, blobs=blobs, parse_pool=parse_pool)
+    metrics.rate_limit['before'] = analyzer.get_rate_limit()
     
-    analyzer = GitHubRepoAnalyzer(username, token)
+    repos = event_repos = event_repositories(args, analyzer) if args.event else None
+    # A shard still lists every repo (the listing is stored whole) but analyzes only its own
+    shard = args.shard or args.repo_range
+    selected = lambda repo: not shard or in_shard(shard, analyzer.repo_path(repo))
     
-    print("🔍 Fetching repositories...")
-    repos = analyzer.get_repositories()
+    def stream_repositories():
+        # Repos are analyzed as their listing pages arrive; the phase ends with the last page
+        with metrics.phase('repo_fetch'):
+            for repo in analyzer.iter_repositories():
+                repos.append(repo)
+                if not selected(repo):
+                    continue
+                # Hold back enough budget for the releases/contributors calls ranking needs
+                if not (repo['fork'] or repo['archived']) and (repo['stargazers_count'] or repo.get('forks_count')):
+                    analyzer.scheduler.reserve += METRICS_CALLS_PER_REPO
+                yield repo
+    
+    if repos is not None:
+        print("🔍 Analyzing changed repositories...")
+        with metrics.phase('language_analysis'), metrics.profile('analyze_repository_languages'):
+            analyzer.analyze_repository_languages(filter(selected, repos))
+    else:
+        repos = []
+        print("🔍 Fetching repositories and analyzing technologies...")
+        with metrics.phase('language_analysis'), metrics.profile('analyze_repository_languages'):
+            analyzer.analyze_repository_languages(stream_repositories())
+    if parse_pool:
+        parse_pool.shutdown()
     print(f"📦 Found {len(repos)} repositories")
+    if analyzer.listing_complete and snapshot:
+        snapshot.prune(repos, [analyzer.username])
+        snapshot.store_listing(analyzer.owner_key, repos)
+    elif snapshot:
+        print("⚠️  Repository listing incomplete; kept the stored listing and records")
+    shard_repos = [repo for repo in repos if selected(repo)]
+    if shard:
+        print(f"🧩 Shard {shard_label(shard)}: analyzing {len(shard_repos)} of them")
     
     # Show first few repos for debugging
     for i, repo in enumerate(repos[:5]):
         print(f"  {i+1}. {repo['name']} ({repo.get('language', 'Unknown')})")
     
-    print("🔬 Analyzing technologies...")
-    analyzer.analyze_repository_languages(repos)
-    
     # Debug: Show detected technologies
     print(f"🔍 Detected technologies: {dict(analyzer.tech_usage)}")
     
     print("🎨 Generating badges...")
-    badges = analyzer.generate_tech_badges()
+    with metrics.phase('badge_generation'):
+        badges = analyzer.generate_tech_badges()
     
     # Debug: Show generated badges
     for category, badge_list in badges.items():
@@ -573,19 +1229,237 @@ def main():
             print(f"  {category}: {len(badge_list)} badges")
     
     print("🌟 Finding popular repositories...")
-    popular_repos = analyzer.get_popular_repos(repos)
+    with metrics.phase('popular_ranking'), metrics.profile('get_popular_repos'):
+        popular_repos = analyzer.get_popular_repos(shard_repos)
     print(f"  Found {len(popular_repos)} featured projects")
     
+    if shard:
+        # Repo paths break score ties in the merge as they do in get_popular_repos()
+        paths = {repo['name']: analyzer.repo_path(repo) for repo in shard_repos}
+        partial = write_partial(args.partial or default_partial_path(shard), analyzer.owner_key, shard,
+                                len(shard_repos), analyzer.tech_usage,
+                                [(paths[repo['name']], repo) for repo in popular_repos])
+        print(f"🧩 Partial result written to {partial}")
+        sections = None
+    else:
+        sections = render_sections(args, analyzer, badges, popular_repos)
+    
     # Debug: Show top projects with their scores
     print("🏆 Top ranked projects:")
     for i, repo in enumerate(popular_repos, 1):
         print(f"  {i}. {repo['name']} (Score: {repo['score']:.1f})")
         print(f"     ⭐ {repo['stars']} stars | 🔀 {repo['forks']} forks | 👥 {repo['contributors_count']} contributors | 🚀 {repo['releases_count']} releases")
     
-    print("📝 Updating README...")
-    analyzer.update_readme(badges, popular_repos)
+    close_sources(args, snapshot, blobs, recorder, replay)
+    
+    print(f"📡 API: {analyzer.scheduler.summary()}")
+    if analyzer.scheduler.skipped:
+        print(f"⚠️  Rate-limit budget ran out; skipped calls ({analyzer.scheduler.skipped_summary()}), "
+              f"used last known data for {snapshot.stats['stale']} records")
+    report_http(analyzer.session, metrics)
+    if analyzer.mirror:
+        print(f"🌿 Git mirrors: {analyzer.mirror.summary()}")
     
     print(f"🚀 Tech analysis complete! Found {len(analyzer.tech_usage)} technologies.")
+    if cache:
+        print(f"🗄️  API cache: {cache.summary()}")
+    
+    metrics.rate_limit['after'] = analyzer.get_rate_limit()
+    metrics.extra.update({
+        'repos': len(repos),
+        'mode': 'full' if event_repos is None else 'event',
+        'shard': shard_label(shard) if shard else None,
+        'technologies': len(analyzer.tech_usage),
+        'featured': [repo['name'] for repo in popular_repos],
+        'cache': dict(cache.stats) if cache else None,
+        'snapshot': dict(snapshot.stats) if snapshot else None,
+        'blobs': dict(blobs.stats) if blobs else None,
+        'clones': dict(analyzer.mirror.stats) if analyzer.mirror else None,
+        'scheduler': {**analyzer.scheduler.stats, 'skipped': dict(analyzer.scheduler.skipped)},
+        **archive_report(args, recorder, replay),
+    })
+    return sections
+
+
+
+def check_readme(args, sections, metrics):
+    """--check/--diff: report whether this run would change the README or its badges; returns the exit status"""
+    content, new_content, missing = plan_sections(sections, README_PATH, insert_missing=insert_sections)
+    readme_changed = new_content != content
+    badges = metrics.extra.get('badges') or {}
+    badges_changed = bool(badges.get('rendered') or badges.get('removed'))
+    
+    if args.diff and readme_changed:
+        sys.stdout.write(unified_diff(content, new_content, README_PATH))
+    for name in sorted(missing):
+        print(f"⚠️  Markers for section '{name}' not found in README.md")
+    if readme_changed or badges_changed:
+        changes = [what for what, changed in (("README.md", readme_changed), ("badge SVGs", badges_changed)) if changed]
+        print(f"✏️  Would update {' and '.join(changes)}")
+    else:
+        print("✅ No changes")
+    metrics.extra['check'] = {'readme_changed': readme_changed, 'badges_changed': badges_changed}
+    return 1 if readme_changed or badges_changed else 0
+
+
+def parse_account(spec):
+    """'org:acme' -> ('orgs', 'acme'); 'user:alice' or plain 'alice' -> ('users', 'alice')"""
+    kind, _, login = spec.rpartition(':')
+    if kind not in ('', 'user', 'org') or not login:
+        raise argparse.ArgumentTypeError(f"expected user:LOGIN, org:LOGIN or LOGIN, got {spec!r}")
+    return ('orgs' if kind == 'org' else 'users', login)
+
+
+def run_accounts(args, metrics):
+    """Analyze several users and orgs in one run with a shared session, cache, scheduler and snapshot.
+
+    Writes <login>.md (the README sections) and <login>.json per account to
+    args.output_dir. Repos listed under more than one account are analyzed once.
+    """
+    token = os.getenv('GITHUB_TOKEN')
+    if not token and not args.replay:
+        print("❌ No GITHUB_TOKEN found!")
+        return False
+    if args.backend == 'clone' and (args.record or args.replay):
+        print("❌ --record and --replay archive API responses; the clone backend reads git mirrors instead")
+        return False
+    
+    workers = int(os.getenv('ANALYZER_WORKERS', '8'))
+    cache, snapshot, blobs, recorder, replay = open_sources(args)
+    parse_pool = make_parse_pool()
+    session = make_session(workers)
+    mirror = GitMirror(token=token) if args.backend == 'clone' else None
+    scheduler = RateLimitScheduler()
+    results = {}
+    weights = load_weights(args.ranking_weights)
+    analyzers = [
+        GitHubRepoAnalyzer(login, token, cache=cache, session=session, max_workers=workers, backend=args.backend,
+                           snapshot=snapshot, scheduler=scheduler, metrics=metrics, owner_type=owner_type,
+                           results=results, ranking_weights=weights, recorder=recorder, replay=replay,
+                           blobs=blobs, parse_pool=parse_pool, mirror=mirror)
+        for owner_type, login in dict.fromkeys(args.account)
+    ]
+    metrics.rate_limit['before'] = analyzers[0].get_rate_limit()
+    
+    print(f"🔍 Fetching repositories for {len(analyzers)} accounts...")
+    with metrics.phase('repo_fetch'), ThreadPoolExecutor(max_workers=min(len(analyzers), workers)) as pool:
+        account_repos = list(pool.map(lambda analyzer: analyzer.get_repositories(), analyzers))
+    
+    unique = {}
+    for analyzer, repos in zip(analyzers, account_repos):
+        for repo in repos:
+            unique.setdefault(analyzer.repo_path(repo), repo)
+    print(f"📦 Found {len(unique)} unique repositories ({sum(map(len, account_repos))} listed)")
+    if snapshot and all(analyzer.listing_complete for analyzer in analyzers):
+        snapshot.prune(list(unique.values()), [analyzer.username for analyzer in analyzers])
+    
+    # Hold back enough budget for the releases/contributors calls ranking needs
+    scheduler.reserve = METRICS_CALLS_PER_REPO * sum(
+        1 for repo in unique.values()
+        if not (repo['fork'] or repo['archived']) and (repo['stargazers_count'] or repo.get('forks_count'))
+    )
+    
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary = {}
+    for analyzer, repos in zip(analyzers, account_repos):
+        login = analyzer.username
+        print(f"🔬 {login}: analyzing {len(repos)} repositories...")
+        with metrics.phase(f'language_analysis:{login}'):
+            analyzer.analyze_repository_languages(repos)
+        with metrics.phase(f'popular_ranking:{login}'):
+            popular_repos = analyzer.get_popular_repos(repos)
+        badges = analyzer.generate_tech_badges()
+        sections = analyzer.readme_sections(badges, popular_repos)  # Shields links: the .md can live anywhere
+        
+        write_atomic(output_dir / f"{login}.md",
+                     "\n\n".join(wrap_section(name, body) for name, body in sections.items()) + "\n")
+        account = {
+            'login': login,
+            'type': analyzer.owner_type,
+            'repos': len(repos),
+            'technologies': dict(sorted(analyzer.tech_usage.items(), key=lambda item: (-item[1], item[0]))),
+            'featured': popular_repos,
+        }
+        write_atomic(output_dir / f"{login}.json", json.dumps(account, indent=2) + "\n")
+        summary[login] = {'repos': len(repos), 'technologies': len(analyzer.tech_usage),
+                          'featured': [repo['name'] for repo in popular_repos]}
+        print(f"  ✅ {login}: {len(analyzer.tech_usage)} technologies, {len(popular_repos)} featured projects")
+    
+    if parse_pool:
+        parse_pool.shutdown()
+    close_sources(args, snapshot, blobs, recorder, replay)
+    print(f"📡 API: {scheduler.summary()}")
+    if scheduler.skipped:
+        print(f"⚠️  Rate-limit budget ran out; skipped calls ({scheduler.skipped_summary()}), "
+              f"used last known data for {snapshot.stats['stale']} records")
+    report_http(session, metrics)
+    if mirror:
+        print(f"🌿 Git mirrors: {mirror.summary()}")
+    if cache:
+        print(f"🗄️  API cache: {cache.summary()}")
+    
+    metrics.rate_limit['after'] = analyzers[0].get_rate_limit()
+    metrics.extra.update({
+        'repos': len(unique),
+        'accounts': summary,
+        'cache': dict(cache.stats) if cache else None,
+        'snapshot': dict(snapshot.stats) if snapshot else None,
+        'blobs': dict(blobs.stats) if blobs else None,
+        'clones': dict(mirror.stats) if mirror else None,
+        'scheduler': {**scheduler.stats, 'skipped': dict(scheduler.skipped)},
+        **archive_report(args, recorder, replay),
+    })
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze GitHub repositories and update the README tech stack")
+    add_arguments(parser)
+    parser.add_argument('--account', action='append', type=parse_account, metavar='[user:|org:]LOGIN',
+                        help="Analyze these users/orgs (repeatable) and write per-account output instead of README.md")
+    parser.add_argument('--output-dir', default='reports/accounts',
+                        help="Where --account mode writes <login>.md and <login>.json")
+    args = parser.parse_args()
+    
+    if args.account and args.event:
+        parser.error("--event applies to the README account, not --account runs")
+    if args.account and (args.check or args.diff):
+        parser.error("--check and --diff apply to README.md, not --account runs")
+    if args.account and (args.shard or args.repo_range or args.merge):
+        parser.error("--shard, --repo-range and --merge apply to the README account, not --account runs")
+    if (args.shard or args.repo_range) and (args.check or args.diff):
+        parser.error("a shard writes a partial result, not README.md; use --check or --diff with --merge")
+    
+    metrics = RunMetrics(profile=args.profile)
+    if args.account:
+        if run_accounts(args, metrics):
+            print(f"🧾 Run report written to {metrics.write(args.report)}")
+        return
+    
+    sections = run_analysis(args, metrics)
+    if sections is None:
+        if args.shard or args.repo_range:
+            print(f"🧾 Run report written to {metrics.write(args.report)}")
+        return
+    
+    if args.check or args.diff:
+        try:
+            status = check_readme(args, sections, metrics)
+        except FileNotFoundError:
+            print("README.md not found")
+            status = 2
+        print(f"🧾 Run report written to {metrics.write(args.report)}")
+        sys.exit(status)
+    
+    print("📝 Updating README...")
+    with metrics.phase('readme_rewrite'):
+        try:
+            update_sections(sections, README_PATH, insert_missing=insert_sections)
+            print("✅ README updated with tech stack and featured projects!")
+        except FileNotFoundError:
+            print("README.md not found")
+    
+    print(f"🧾 Run report written to {metrics.write(args.report)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
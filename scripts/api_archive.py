@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Record and replay GitHub API responses.
+
+A recording run appends every response the analyzer consumes (after the
+conditional-request cache has resolved 304s) to a gzip-compressed JSONL
+archive. A replay run serves the analyzer entirely from that archive, so
+rendering and ranking changes can be iterated on without network access or
+rate-limit budget, and with the clock pinned to the recording time.
+
+Entries are indexed by method, URL and a digest of the request body (the
+GraphQL query). Request headers other than Authorization are stored with
+each entry for reference.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+ARCHIVE_VERSION = 1
+
+# Response headers the analyzer reads (pagination, rate limit, validators)
+KEPT_HEADERS = ('Link', 'ETag', 'Last-Modified', 'Retry-After',
+                'X-RateLimit-Limit', 'X-RateLimit-Remaining', 'X-RateLimit-Reset')
+
+
+def request_key(method, url, payload=None, api_url=None):
+    """Index key; URLs are stored relative to the API root so an archive replays against any GITHUB_API_URL"""
+    if api_url and url.startswith(api_url):
+        url = url[len(api_url):]
+    digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest() if payload else ''
+    return f"{method} {url} {digest}".rstrip()
+
+
+class ArchivedResponse:
+    """Minimal stand-in for requests.Response built from an archive entry."""
+
+    def __init__(self, status_code, text, headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.from_archive = True
+
+    @property
+    def content(self):
+        return self.text.encode("utf-8")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class ArchiveRecorder:
+    def __init__(self, path, api_url=None):
+        self.path = path
+        self.api_url = api_url
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._write({
+            'version': ARCHIVE_VERSION,
+            'recorded_at': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            'api_url': api_url,
+        })
+
+    def _write(self, obj):
+        self._file.write(json.dumps(obj, separators=(',', ':')) + "\n")
+
+    def record(self, method, url, response, headers=None, payload=None):
+        entry = {
+            'key': request_key(method, url, payload, self.api_url),
+            'request_headers': {k: v for k, v in (headers or {}).items() if k.lower() != 'authorization'},
+            'status': response.status_code,
+            'headers': {k: response.headers[k] for k in KEPT_HEADERS if response.headers.get(k)},
+            'body': response.text,
+        }
+        with self._lock:
+            self._write(entry)
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class ArchiveReplayer:
+    def __init__(self, path, api_url=None):
+        self.path = path
+        self.api_url = api_url
+        self.entries = {}
+        self.misses = 0
+        self._lock = threading.Lock()
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get('version') != ARCHIVE_VERSION:
+                raise ValueError(f"{path}: unsupported archive version {header.get('version')}")
+            self.recorded_at = header['recorded_at']
+            for line in f:
+                entry = json.loads(line)
+                # A URL fetched twice (e.g. retried) replays its last response
+                self.entries[entry['key']] = entry
+
+    def response(self, method, url, payload=None):
+        entry = self.entries.get(request_key(method, url, payload, self.api_url))
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return ArchivedResponse(404, json.dumps({'message': 'Not in archive'}))
+        return ArchivedResponse(entry['status'], entry['body'], entry['headers'])
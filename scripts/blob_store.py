@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of manifest detection results.
+
+Git blob SHAs identify file contents, and repos generated from the same
+template share byte-identical manifests. Results are stored per
+(manifest kind, blob SHA), so a blob that has been seen before costs
+neither a download nor a parse, in this run or later ones.
+
+The store is tagged with a digest of tech_detector.py and lockfiles.py. Any
+change to the detector rules or parsers discards the stored results.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import lockfiles
+import tech_detector
+
+DEFAULT_BLOB_STORE_PATH = Path(".cache/blob-detections.json")
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+def detector_version():
+    digest = hashlib.sha1()
+    for module in (tech_detector, lockfiles):
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+class BlobStore:
+    def __init__(self, path=DEFAULT_BLOB_STORE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.version = detector_version()
+        self.blobs = {}  # "kind:sha" -> [{tech: weight}, last used (epoch day)]
+        self.stats = {"hits": 0, "misses": 0}
+        self._today = int(time.time() // 86400)
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("detector") == self.version:
+            self.blobs = data.get("blobs", {})
+
+    def save(self):
+        with self._lock:
+            if len(self.blobs) > self.max_entries:
+                # Keep the most recently used entries
+                keep = sorted(self.blobs.items(), key=lambda item: item[1][1], reverse=True)[:self.max_entries]
+                self.blobs = dict(keep)
+            payload = {"detector": self.version, "blobs": self.blobs}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def get(self, kind, sha):
+        """Return the stored {tech: weight} for a blob, or None if it hasn't been analyzed"""
+        key = f"{kind}:{sha}"
+        with self._lock:
+            entry = self.blobs.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            entry[1] = self._today
+            return dict(entry[0])
+
+    def put(self, kind, sha, usage):
+        with self._lock:
+            self.blobs[f"{kind}:{sha}"] = [dict(usage), self._today]
+
+    def summary(self):
+        return f"{self.stats['hits']} hits, {self.stats['misses']} misses, {len(self.blobs)} blobs stored"
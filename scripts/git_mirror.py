@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Local partial clones for the clone analysis backend.
+
+Each repository is mirrored as a bare, shallow, partial clone under
+.cache/git-mirrors/<owner>/<name>.git:
+
+    git clone --bare --depth=1 --filter=blob:limit=16k --no-tags <url>
+
+Only the default branch tip is fetched, and blobs over the limit stay on the
+server until something reads them. Later runs `git fetch` the new tip into
+the same mirror, which transfers only the objects that changed.
+
+The tree is walked locally. Manifests are found at any depth and read with
+`git cat-file`; a manifest left out by the filter is fetched on read.
+Language byte counts are summed from blob sizes. A blob the filter left out
+counts as the limit, a lower bound. Language weights cap at 10 KB, so with a
+limit of at least 10 KB the weights are exact.
+
+Clone URLs come from a template (ANALYZER_CLONE_URL, default
+https://github.com/{full_name}.git). Pointing it at local bare repositories,
+e.g. /srv/mirrors/{full_name}.git, runs the backend fully offline. Those
+repositories need uploadpack.allowFilter=true for the filter to apply;
+otherwise they send every blob.
+"""
+
+import base64
+import os
+import shutil
+import subprocess
+import threading
+from collections import defaultdict
+from pathlib import Path, PurePosixPath
+
+DEFAULT_MIRROR_DIR = Path(os.getenv('ANALYZER_MIRROR_DIR', '.cache/git-mirrors'))
+DEFAULT_URL_TEMPLATE = os.getenv('ANALYZER_CLONE_URL', 'https://github.com/{full_name}.git')
+DEFAULT_BLOB_LIMIT = 16 * 1024
+GIT_TIMEOUT = 300
+
+# Extensions GitHub's linguist counts as code, by language name
+LANGUAGE_EXTENSIONS = {
+    '.py': 'Python', '.pyi': 'Python', '.pyx': 'Cython', '.ipynb': 'Jupyter Notebook',
+    '.js': 'JavaScript', '.mjs': 'JavaScript', '.cjs': 'JavaScript', '.jsx': 'JavaScript',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript', '.mts': 'TypeScript', '.cts': 'TypeScript',
+    '.java': 'Java', '.go': 'Go', '.rs': 'Rust',
+    '.cpp': 'C++', '.cc': 'C++', '.cxx': 'C++', '.hpp': 'C++', '.hh': 'C++', '.hxx': 'C++',
+    '.c': 'C', '.h': 'C', '.cs': 'C#', '.m': 'Objective-C',
+    '.php': 'PHP', '.rb': 'Ruby', '.swift': 'Swift', '.kt': 'Kotlin', '.kts': 'Kotlin', '.dart': 'Dart',
+    '.scala': 'Scala', '.lua': 'Lua', '.r': 'R', '.jl': 'Julia', '.ex': 'Elixir', '.exs': 'Elixir',
+    '.sh': 'Shell', '.bash': 'Shell', '.zsh': 'Shell', '.ps1': 'PowerShell',
+    '.html': 'HTML', '.htm': 'HTML', '.css': 'CSS', '.scss': 'SCSS', '.sass': 'Sass', '.less': 'Less',
+    '.vue': 'Vue', '.svelte': 'Svelte', '.tf': 'HCL', '.hcl': 'HCL', '.sol': 'Solidity',
+}
+LANGUAGE_FILENAMES = {'Dockerfile': 'Dockerfile', 'Makefile': 'Makefile'}
+
+# Vendored and generated directories linguist leaves out of language statistics
+VENDORED_DIRS = {'node_modules', 'vendor', 'bower_components', '.venv', 'venv', 'site-packages',
+                 'third_party', 'dist', '__pycache__'}
+
+
+class GitError(Exception):
+    """A git command failed"""
+
+
+def file_language(path):
+    """Linguist language of a tree path, or None for data, docs and vendored files"""
+    parts = PurePosixPath(path)
+    if any(part in VENDORED_DIRS for part in parts.parts[:-1]) or parts.name.endswith(('.min.js', '.min.css')):
+        return None
+    if parts.name in LANGUAGE_FILENAMES:
+        return LANGUAGE_FILENAMES[parts.name]
+    return LANGUAGE_EXTENSIONS.get(parts.suffix.lower())
+
+
+class GitMirror:
+    def __init__(self, root=DEFAULT_MIRROR_DIR, url_template=DEFAULT_URL_TEMPLATE, token=None,
+                 blob_limit=DEFAULT_BLOB_LIMIT):
+        self.root = Path(root)
+        self.url_template = url_template
+        self.blob_limit = blob_limit
+        self.stats = {"cloned": 0, "updated": 0, "unchanged": 0, "empty": 0}
+        self._locks = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+
+        self._env = {**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+        if token:
+            # Passed through the environment so the token never shows up in a process listing
+            credentials = base64.b64encode(f"x-access-token:{token}".encode()).decode()
+            self._env.update({'GIT_CONFIG_COUNT': '1', 'GIT_CONFIG_KEY_0': 'http.extraHeader',
+                              'GIT_CONFIG_VALUE_0': f"Authorization: basic {credentials}"})
+
+    def url(self, full_name):
+        url = self.url_template.format(full_name=full_name)
+        # A plain path would be copied locally, ignoring the filter; file:// goes through upload-pack
+        if os.path.isabs(url) or url.startswith('.'):
+            return Path(url).resolve().as_uri()
+        return url
+
+    def _git(self, git_dir, *args):
+        command = ['git', *(['--git-dir', str(git_dir)] if git_dir else []), *args]
+        try:
+            result = subprocess.run(command, capture_output=True, env=self._env, timeout=GIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            raise GitError(f"git {args[0]} timed out after {GIT_TIMEOUT}s")
+        if result.returncode != 0:
+            lines = result.stderr.decode('utf-8', errors='replace').strip().splitlines()
+            errors = [line for line in lines if line.startswith(('fatal:', 'error:'))] or lines
+            raise GitError(f"git {args[0]}: {errors[0] if errors else f'exit status {result.returncode}'}")
+        return result.stdout
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _tip(self, git_dir):
+        try:
+            return self._git(git_dir, 'rev-parse', '--verify', '--quiet', 'HEAD^{commit}').decode().strip()
+        except GitError:
+            return None
+
+    def sync(self, full_name):
+        """Clone or update the mirror of `full_name`; returns (git dir, tip commit), commit None if empty"""
+        git_dir = self.root / f"{full_name.lower()}.git"
+        with self._lock:
+            lock = self._locks[git_dir]
+        with lock:
+            if not (git_dir / 'HEAD').exists():
+                return git_dir, self._clone(full_name, git_dir)
+            before = self._tip(git_dir)
+            try:
+                self._git(git_dir, 'fetch', '--quiet', '--depth=1', f'--filter=blob:limit={self.blob_limit}',
+                          '--no-tags', 'origin', 'HEAD')
+            except GitError as e:
+                if "couldn't find remote ref" in str(e):
+                    self._count('empty')
+                    return git_dir, None
+                raise
+            # Remote HEAD is the default branch; point our HEAD's branch at its tip
+            self._git(git_dir, 'update-ref', 'HEAD', 'FETCH_HEAD')
+            tip = self._tip(git_dir)
+            self._count('unchanged' if tip == before else 'updated')
+            return git_dir, tip
+
+    def _clone(self, full_name, git_dir):
+        # Clone next to the mirror and move it in place, so an interrupted clone never looks complete
+        partial = git_dir.with_name(git_dir.name + '.partial')
+        shutil.rmtree(partial, ignore_errors=True)
+        git_dir.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._git(None, 'clone', '--quiet', '--bare', '--depth=1', f'--filter=blob:limit={self.blob_limit}',
+                      '--no-tags', '--single-branch', self.url(full_name), str(partial))
+        except GitError:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise
+        os.replace(partial, git_dir)
+        tip = self._tip(git_dir)
+        self._count('cloned' if tip else 'empty')
+        return tip
+
+    def files(self, git_dir, commit):
+        """[(path, blob sha, size)] of every file at `commit`; size is None for blobs the filter left out"""
+        sizes = {}
+        # Lists only the objects present locally, so nothing is fetched
+        for line in self._git(git_dir, 'cat-file', '--batch-all-objects',
+                              '--batch-check=%(objectname) %(objecttype) %(objectsize)').splitlines():
+            sha, kind, size = line.decode().split()
+            if kind == 'blob':
+                sizes[sha] = int(size)
+
+        files = []
+        for record in self._git(git_dir, 'ls-tree', '-r', '-z', '--full-tree', commit).split(b'\0'):
+            if not record:
+                continue
+            info, path = record.split(b'\t', 1)
+            mode, kind, sha = info.decode().split()
+            # Skip submodules (commits) and symlinks
+            if kind == 'blob' and mode != '120000':
+                files.append((path.decode('utf-8', errors='replace'), sha, sizes.get(sha)))
+        return files
+
+    def language_bytes(self, files):
+        """{language: bytes} for files(), like the /languages endpoint"""
+        languages = defaultdict(int)
+        for path, _, size in files:
+            language = file_language(path)
+            if language:
+                languages[language] += self.blob_limit if size is None else size
+        return dict(sorted(languages.items(), key=lambda item: -item[1]))
+
+    def read(self, git_dir, sha):
+        """Contents of a blob, fetched from the remote first if the filter left it out"""
+        return self._git(git_dir, 'cat-file', 'blob', sha)
+
+    def summary(self):
+        return ", ".join(f"{count} {key}" for key, count in self.stats.items())
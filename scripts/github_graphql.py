@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+GraphQL data source for GitHubRepoAnalyzer.
+
+The REST path costs roughly 1 + 5*N requests for N repos plus manifest blobs
+(languages, tree, releases, contributors, commits). The GraphQL API returns
+languages, release and commit counts for a page of repositories in a single
+query, so those take ceil(N / page_size) requests.
+
+GraphQL has no contributors connection; mentionableUsers counts the owner
+and collaborators, not commit authors. The analyzer counts contributors over
+REST for the ranking candidates, as the REST path does.
+
+Manifests still come from the REST tree listing: GraphQL can read a path it
+is given (`object(expression: "HEAD:package.json")`) but can't list a tree
+recursively, and probing fixed root paths misses nested manifests and
+lockfiles the REST path finds.
+
+Results are converted into the same shapes the REST path produces: a
+REST-style repo dict, a {language: bytes} map and a metrics dict matching
+get_detailed_repo_metrics().
+"""
+
+REPOSITORIES_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  repositoryOwner(login: $login) {
+    repositories(first: $first, after: $after, privacy: PUBLIC, ownerAffiliations: OWNER,
+                 orderBy: {field: CREATED_AT, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        owner { login }
+        description
+        url
+        homepageUrl
+        isFork
+        isArchived
+        isPrivate
+        stargazerCount
+        forkCount
+        diskUsage
+        createdAt
+        updatedAt
+        pushedAt
+        primaryLanguage { name }
+        watchers { totalCount }
+        issues(states: OPEN) { totalCount }
+        pullRequests(states: OPEN) { totalCount }
+        defaultBranchRef {
+          name
+          target { ... on Commit { history { totalCount } } }
+        }
+        languages(first: 100) { edges { size node { name } } }
+        latestRelease { tagName name publishedAt url }
+        releases { totalCount }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLError(Exception):
+    pass
+
+
+class GraphQLSource:
+    """Pages through an account's repositories with one query per page"""
+
+    def __init__(self, post, url, page_size=25):
+        self.post = post  # post(url, payload) -> response
+        self.url = url
+        self.page_size = page_size
+
+    def query(self, query, variables):
+        response = self.post(self.url, {'query': query, 'variables': variables})
+        if response.status_code != 200:
+            raise GraphQLError(f"HTTP {response.status_code}")
+        payload = response.json()
+        if payload.get('errors'):
+            raise GraphQLError("; ".join(e.get('message', '?') for e in payload['errors']))
+        return payload['data']
+
+    def fetch_repositories(self, login):
+        """Yield (repo, languages, metrics) for every repository of `login`"""
+        cursor = None
+        while True:
+            data = self.query(REPOSITORIES_QUERY, {'login': login, 'first': self.page_size, 'after': cursor})
+            owner = data.get('repositoryOwner')
+            if not owner:
+                raise GraphQLError(f"Unknown user or organization: {login}")
+
+            connection = owner['repositories']
+            for node in connection['nodes']:
+                yield convert_node(node)
+
+            if not connection['pageInfo']['hasNextPage']:
+                break
+            cursor = connection['pageInfo']['endCursor']
+
+
+def convert_node(node):
+    """Convert a repository node into the REST-shaped dicts the analyzer consumes"""
+    branch = node.get('defaultBranchRef') or {}
+    history = (branch.get('target') or {}).get('history') or {}
+
+    repo = {
+        'name': node['name'],
+        'full_name': node['nameWithOwner'],
+        'owner': {'login': node['owner']['login']},
+        'description': node.get('description'),
+        'html_url': node['url'],
+        'homepage': node.get('homepageUrl') or None,
+        'fork': node['isFork'],
+        'archived': node['isArchived'],
+        'private': node['isPrivate'],
+        'stargazers_count': node['stargazerCount'],
+        'forks_count': node['forkCount'],
+        'watchers_count': node['watchers']['totalCount'],
+        # REST's open_issues_count includes open pull requests
+        'open_issues_count': node['issues']['totalCount'] + node['pullRequests']['totalCount'],
+        'size': node.get('diskUsage') or 0,
+        'language': (node.get('primaryLanguage') or {}).get('name'),
+        'created_at': node['createdAt'],
+        'updated_at': node['updatedAt'],
+        'pushed_at': node.get('pushedAt'),
+        'default_branch': branch.get('name'),
+    }
+
+    languages = {edge['node']['name']: edge['size'] for edge in node['languages']['edges']}
+
+    latest = node.get('latestRelease')
+    metrics = {
+        'releases_count': node['releases']['totalCount'],
+        'commits_count': history.get('totalCount', 0),
+        'issues_count': repo['open_issues_count'],
+        'forks': repo['forks_count'],
+        'watchers': repo['watchers_count'],
+        'size_kb': repo['size'],
+        'latest_release': {'tag_name': latest['tagName'], 'name': latest.get('name'),
+                           'published_at': latest.get('publishedAt'), 'html_url': latest['url']} if latest else None,
+    }
+
+    return repo, languages, metrics
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache for GitHub API calls.
+
+Stores the body together with the ETag / Last-Modified validators and sends
+If-None-Match / If-Modified-Since on the next run. GitHub does not count 304
+responses against the rate limit, so unchanged data costs neither quota nor
+a full download.
+
+Entries are keyed by URL and a digest of the Authorization header, so a
+response fetched with one token is never served to a request made with
+another. They keep the response headers, and the headers of a 304 update
+them (fresh rate-limit and validator values).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIR = Path(".cache/github-api")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+
+# Transport headers that describe the wire encoding, not the cached body
+UNCACHED_HEADERS = {'connection', 'content-encoding', 'content-length', 'keep-alive', 'transfer-encoding'}
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response built from a cache entry."""
+
+    def __init__(self, status_code, text, headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.from_cache = True
+
+    @property
+    def content(self):
+        return self.text.encode("utf-8")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class ResponseCache:
+    """Size-bounded, LRU-evicted store of conditional GET responses."""
+
+    def __init__(self, path=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Entry sizes, least recently used first; mtimes carry the order across runs
+        self._sizes = OrderedDict()
+        for entry_path, stat in sorted(((p, p.stat()) for p in self.path.glob("*.json")),
+                                       key=lambda item: item[1].st_mtime):
+            self._sizes[entry_path] = stat.st_size
+        self._total = sum(self._sizes.values())
+
+    @staticmethod
+    def identity(session, headers):
+        """Digest of the credentials a request is made with ('' when anonymous)"""
+        auth = headers.get("Authorization") or session.headers.get("Authorization")
+        return hashlib.sha256(auth.encode("utf-8")).hexdigest()[:16] if auth else ""
+
+    def _entry_path(self, url, identity):
+        return self.path / f"{hashlib.sha1(f'{identity} {url}'.encode('utf-8')).hexdigest()}.json"
+
+    def _load(self, url, identity):
+        entry_path = self._entry_path(url, identity)
+        try:
+            with open(entry_path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Guard against the (unlikely) sha1 collision
+        return entry if entry.get("url") == url and entry.get("identity", "") == identity else None
+
+    def _store(self, url, identity, response, headers):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            "url": url,
+            "identity": identity,
+            "etag": etag,
+            "last_modified": last_modified,
+            "status": response.status_code,
+            "headers": headers,
+            "body": response.text,
+        }
+        entry_path = self._entry_path(url, identity)
+        tmp_path = entry_path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, entry_path)
+
+        size = entry_path.stat().st_size
+        with self._lock:
+            self._total += size - self._sizes.pop(entry_path, 0)
+            self._sizes[entry_path] = size
+            self._evict()
+
+    @staticmethod
+    def _kept_headers(response):
+        return {key: value for key, value in response.headers.items() if key.lower() not in UNCACHED_HEADERS}
+
+    def _touch(self, entry_path):
+        with self._lock:
+            if entry_path in self._sizes:
+                self._sizes.move_to_end(entry_path)
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits max_bytes (called with the lock held)."""
+        while self._total > self.max_bytes and self._sizes:
+            entry_path, size = self._sizes.popitem(last=False)
+            self._total -= size
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
+            self.stats["evicted"] += 1
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(self, session, url, headers=None, **kwargs):
+        """GET `url` through `session`, revalidating against the cached copy."""
+        headers = dict(headers or {})
+        identity = self.identity(session, headers)
+        entry = self._load(url, identity)
+
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            self._count("revalidated")
+        else:
+            self._count("misses")
+
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self._count("hits")
+            # Mark as recently used, here and (through the mtime) for later runs
+            entry_path = self._entry_path(url, identity)
+            self._touch(entry_path)
+            try:
+                os.utime(entry_path)
+            except OSError:
+                pass
+            return CachedResponse(entry["status"], entry["body"],
+                                  {**entry.get("headers", {}), **self._kept_headers(response)})
+
+        if response.status_code == 200:
+            self._store(url, identity, response, self._kept_headers(response))
+
+        return response
+
+    def summary(self):
+        s = self.stats
+        return f"{s['hits']} hits, {s['misses']} misses, {s['revalidated']} revalidated, {s['evicted']} evicted"
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Resilient HTTP session shared by the update scripts.
+
+ResilientSession is a drop-in requests.Session that adds:
+
+- connect/read timeouts on every request that doesn't set its own
+- bounded retries with exponential backoff and full jitter on connection
+  errors, timeouts and retryable statuses (5xx by default), within a
+  per-request deadline so one call can never stall a run
+- a per-host circuit breaker: after `failure_threshold` consecutive
+  failures the host is skipped for `cooldown` seconds (CircuitOpen is
+  raised immediately), then a single probe decides whether it recovered
+- optional hedging: a GET that hasn't answered after `hedge_after`
+  seconds is sent a second time and the first response wins
+
+Rate-limit responses (403/429 from GitHub) are not retried here; the
+RateLimitScheduler owns those. Every retry, timeout, error, fast failure
+and hedge is counted in `stats`.
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = (5, 30)          # (connect, read) seconds
+DEFAULT_RETRIES = 3                # Attempts after the first
+DEFAULT_DEADLINE = 90.0            # Seconds one request may take, retries included
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_STATUSES = frozenset((500, 502, 503, 504))
+RETRY_METHODS = frozenset(('GET', 'HEAD'))
+
+FAILURE_THRESHOLD = 5
+COOLDOWN = 30.0
+
+RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+class CircuitOpen(requests.ConnectionError):
+    """Raised without sending when a host's circuit breaker is open"""
+
+
+def _discard(future):
+    if future.exception() is None:
+        future.result().close()
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'half-open' if time.monotonic() - self.opened_at >= self.cooldown else 'open'
+
+    def allow(self):
+        """'pass' or 'probe' if a request may be sent, else None; in half-open state only one probe at a time"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return 'pass'
+            if state == 'half-open' and not self.probing:
+                self.probing = True
+                return 'probe'
+            return None
+
+    def settle(self, ok):
+        """Record the outcome of an allowed request; returns True if it opened the circuit"""
+        if ok:
+            self.success()
+            return False
+        return self.failure()
+
+    def release(self):
+        """Give up a probe that ended without an outcome, so the next request can probe"""
+        with self._lock:
+            self.probing = False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def failure(self):
+        """Count a failure; returns True if it opened the circuit"""
+        with self._lock:
+            self.failures += 1
+            was_closed = self.opened_at is None
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self.probing = False
+                return was_closed
+            return False
+
+
+class ResilientSession(requests.Session):
+    def __init__(self, pool_size=16, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, deadline=DEFAULT_DEADLINE,
+                 retry_statuses=RETRY_STATUSES, retry_methods=RETRY_METHODS, hedge_after=None,
+                 failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN, backoff_base=BACKOFF_BASE,
+                 backoff_cap=BACKOFF_CAP):
+        super().__init__()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.timeout = timeout
+        self.retries = retries
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(retry_methods)
+        self.hedge_after = hedge_after
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.stats = Counter()
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=pool_size) if hedge_after else None
+
+    def breaker(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.cooldown)
+            return self._breakers[host]
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        method = method.upper()
+        breaker = self.breaker(url)
+        retries = self.retries if method in self.retry_methods else 0
+        give_up_at = time.monotonic() + self.deadline
+
+        attempt = 0
+        while True:
+            admission = breaker.allow()
+            if admission is None:
+                self._count('circuit_open')
+                raise CircuitOpen(f"circuit open for {urlparse(url).netloc}; failing fast")
+            self._count('requests')
+            settled = False
+            try:
+                try:
+                    response = self._send_once(method, url, kwargs)
+                except RETRYABLE_ERRORS as e:
+                    self._count('timeouts' if isinstance(e, requests.Timeout) else 'connection_errors')
+                    settled = True
+                    if breaker.settle(ok=False):
+                        self._count('circuit_trips')
+                    if not self._retry(attempt, retries, give_up_at, None):
+                        raise
+                else:
+                    # Every answer settles the breaker: the host is up unless it answered 5xx,
+                    # even when the status (429, WakaTime's 202) is retried
+                    settled = True
+                    if breaker.settle(ok=response.status_code < 500):
+                        self._count('circuit_trips')
+                    if response.status_code not in self.retry_statuses:
+                        return response
+                    self._count(f'status_{response.status_code}')
+                    if not self._retry(attempt, retries, give_up_at, response):
+                        return response
+                    response.close()
+            finally:
+                # Any other error leaves no outcome; free the probe rather than block the host for good
+                if admission == 'probe' and not settled:
+                    breaker.release()
+            attempt += 1
+
+    def _retry(self, attempt, retries, give_up_at, response):
+        """Sleep before the next attempt; False if the retry budget or deadline is spent"""
+        if attempt >= retries:
+            self._count('gave_up')
+            return False
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        if time.monotonic() + delay >= give_up_at:
+            self._count('gave_up')
+            return False
+        self._count('retries')
+        time.sleep(delay)
+        return True
+
+    def _send_once(self, method, url, kwargs):
+        send = lambda: super(ResilientSession, self).request(method, url, **kwargs)
+        if not self._hedge_pool or method != 'GET':
+            return send()
+
+        first = self._hedge_pool.submit(send)
+        done, _ = wait([first], timeout=self.hedge_after)
+        if done:
+            return first.result()
+        self._count('hedged')
+        second = self._hedge_pool.submit(send)
+        done, _ = wait([first, second], return_when=FIRST_COMPLETED)
+        winner = done.pop()
+        loser = second if winner is first else first
+        if winner.exception() is not None:
+            return loser.result()  # The faster copy failed; the other one decides
+        if winner is second:
+            self._count('hedge_wins')
+        # The slower copy is discarded once it finishes
+        loser.add_done_callback(_discard)
+        return winner.result()
+
+    def close(self):
+        if self._hedge_pool:
+            self._hedge_pool.shutdown(wait=False)
+        super().close()
+
+    def summary(self):
+        other = sorted(key for key in self.stats if key != 'requests' and self.stats[key])
+        return ", ".join(f"{self.stats[key]} {key.replace('_', ' ')}" for key in ['requests', *other])
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Run instrumentation and the machine-readable run report.
+
+Records per-phase wall time, per-endpoint request counts, status codes,
+latency histograms and response bytes, plus cache, retry and rate-limit
+figures, and writes them as JSON so run cost can be tracked across cron
+executions. With profiling enabled, selected phases also run under cProfile.
+cProfile only sees the thread that enables it, so thread pool tasks wrapped
+with profiled() are profiled on their own threads and merged into the
+phase's stats.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_REPORT_PATH = Path("reports/run-report.json")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def _bucket_label(ms):
+    for bound in LATENCY_BUCKETS_MS:
+        if ms <= bound:
+            return f"<={bound}ms"
+    return f">{LATENCY_BUCKETS_MS[-1]}ms"
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.statuses = Counter()
+        self.histogram = Counter()
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "avg_ms": round(self.total_ms / self.requests, 2) if self.requests else 0,
+            "max_ms": round(self.max_ms, 2),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "latency_histogram": {label: self.histogram[label] for label in
+                                  [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+                                  if self.histogram[label]},
+        }
+
+
+class RunMetrics:
+    def __init__(self, profile=False, profile_dir=Path("reports/profile")):
+        self.started_at = time.time()
+        self.phases = {}
+        self.endpoints = defaultdict(EndpointStats)
+        self.counters = Counter()
+        self.rate_limit = {}
+        self.extra = {}
+        self.profile_enabled = profile
+        self.profile_dir = Path(profile_dir)
+        self.profiles = {}
+        self._worker_profiles = None  # Profiles of profiled() calls during the active profile() block
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Time a phase of the run"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = {"wall_s": round(time.perf_counter() - start, 4)}
+
+    @contextmanager
+    def profile(self, name, top=25):
+        """Run the block under cProfile if profiling is enabled"""
+        if not self.profile_enabled:
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        self._worker_profiles = workers = []
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._worker_profiles = None
+            stats = pstats.Stats(profiler)
+            # Stats() rejects a profile that recorded nothing
+            for worker in workers:
+                worker.create_stats()
+                if worker.stats:
+                    stats.add(worker)
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            dump_path = self.profile_dir / f"{name}.prof"
+            stats.dump_stats(dump_path)
+
+            top_functions = []
+            for (filename, line, func), (_, ncalls, tottime, cumtime, _) in sorted(
+                    stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]:
+                top_functions.append({
+                    "function": f"{os.path.basename(filename)}:{line}({func})",
+                    "calls": ncalls,
+                    "tottime_s": round(tottime, 4),
+                    "cumtime_s": round(cumtime, 4),
+                })
+            self.profiles[name] = {"pstats": str(dump_path), "threads": 1 + len(workers),
+                                   "top_cumulative": top_functions}
+
+    def profiled(self, fn):
+        """Wrap a thread pool task so its calls inside a profile() block are profiled and merged"""
+        if not self.profile_enabled:
+            return fn
+
+        def run(*args, **kwargs):
+            workers = self._worker_profiles
+            if workers is None:
+                return fn(*args, **kwargs)
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+ profiles every thread from the block's profiler; only one may be active
+                return fn(*args, **kwargs)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.disable()
+                with self._lock:
+                    workers.append(profiler)
+        return run
+
+    def record_request(self, endpoint, status, elapsed_s, nbytes, retried=False):
+        ms = elapsed_s * 1000
+        with self._lock:
+            stats = self.endpoints[endpoint]
+            stats.requests += 1
+            stats.bytes += nbytes
+            stats.total_ms += ms
+            stats.max_ms = max(stats.max_ms, ms)
+            stats.statuses[status] += 1
+            stats.histogram[_bucket_label(ms)] += 1
+            if retried:
+                self.counters["retries"] += 1
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.counters[key] += n
+
+    def to_dict(self):
+        endpoints = {name: stats.to_dict() for name, stats in sorted(self.endpoints.items())}
+        return {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started_at)),
+            "wall_s": round(time.time() - self.started_at, 3),
+            "phases": self.phases,
+            "requests": {
+                "total": sum(e["requests"] for e in endpoints.values()),
+                "bytes": sum(e["bytes"] for e in endpoints.values()),
+                "by_endpoint": endpoints,
+            },
+            "counters": dict(self.counters),
+            "rate_limit": self.rate_limit,
+            **self.extra,
+            **({"profiles": self.profiles} if self.profiles else {}),
+        }
+
+    def write(self, path=DEFAULT_REPORT_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
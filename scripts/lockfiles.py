@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Streaming package-name extraction from lockfiles.
+
+Lockfiles list the whole resolved dependency tree, transitive packages
+included, and routinely run to several megabytes. The parsers here read
+text in chunks and yield package names as they go. Only the current token
+or line and a stack of open JSON containers are held in memory, never the
+document.
+
+- package-lock.json / npm-shrinkwrap.json: an incremental JSON tokenizer
+  yields keys of the "packages" map (lockfile v2/v3) and of every
+  dependencies / requires map (v1 and v2+)
+- yarn.lock (classic and berry): entry header lines
+- poetry.lock, Cargo.lock: `name = "..."` in each [[package]] table, read by
+  a line-level TOML scanner that skips multi-line strings
+"""
+
+import base64
+import codecs
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+
+# package-lock maps whose keys are package names
+_JSON_DEPENDENCY_KEYS = frozenset(('dependencies', 'devDependencies', 'optionalDependencies',
+                                   'peerDependencies', 'requires'))
+
+_JSON_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<punct>[{}\[\]:,])
+      | (?P<scalar>[^\s{}\[\]:,"]+)
+    )''', re.VERBOSE)
+
+_TOML_NAME = re.compile(r'name\s*=\s*"([^"]+)"')
+
+
+def iter_base64_text(encoded, chunk_size=CHUNK_SIZE):
+    """Decode GitHub's line-wrapped base64 blob content as text, `chunk_size` bytes at a time"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+    step = chunk_size * 4 // 3
+    for start in range(0, len(encoded), step):
+        pending += encoded[start:start + step].replace('\n', '')
+        usable = len(pending) - len(pending) % 4
+        if usable:
+            yield decoder.decode(base64.b64decode(pending[:usable]))
+            pending = pending[usable:]
+    yield decoder.decode(base64.b64decode(pending) if pending else b'', final=True)
+
+
+def iter_text_chunks(text, chunk_size=CHUNK_SIZE):
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+
+def iter_lines(chunks):
+    """Lines of a chunked text, holding at most one partial line between chunks"""
+    tail = ''
+    for chunk in chunks:
+        lines = (tail + chunk).split('\n')
+        tail = lines.pop()
+        yield from lines
+    if tail:
+        yield tail
+
+
+def iter_json_tokens(chunks):
+    """(kind, text) tokens of a chunked JSON document; kind is 'string', 'punct' or 'scalar'"""
+    buffer = ''
+    chunks = iter(chunks)
+    done = False
+    while not done:
+        chunk = next(chunks, None)
+        if chunk is None:
+            done = True
+        else:
+            buffer += chunk
+        pos = 0
+        while True:
+            match = _JSON_TOKEN.match(buffer, pos)
+            # A token touching the end of the buffer may continue in the next chunk
+            if not match or (not done and match.end() == len(buffer) and match.lastgroup != 'punct'):
+                break
+            pos = match.end()
+            yield match.lastgroup, match.group(match.lastgroup)
+        buffer = buffer[pos:]
+    if buffer.strip():
+        raise ValueError("truncated JSON document")
+
+
+def _json_string(token):
+    return json.loads(token) if '\\' in token else token[1:-1]
+
+
+def package_lock_names(chunks):
+    # Each open container: [is_map, key it sits under, expecting a key]
+    stack = []
+    pending_key = None
+    for kind, token in iter_json_tokens(chunks):
+        top = stack[-1] if stack else None
+        if kind == 'punct':
+            if token in '{[':
+                stack.append([token == '{', pending_key, token == '{'])
+                pending_key = None
+            elif token in '}]':
+                stack.pop()
+            elif token == ',' and top and top[0]:
+                top[2] = True
+            continue
+        if top and top[0] and top[2]:
+            key = pending_key = _json_string(token) if kind == 'string' else token
+            top[2] = False
+            if top[1] == 'packages' and len(stack) == 2:
+                # "node_modules/a/node_modules/@scope/b" -> "@scope/b"; workspace dirs have no node_modules/
+                if 'node_modules/' in key:
+                    yield key.rsplit('node_modules/', 1)[1]
+            elif top[1] in _JSON_DEPENDENCY_KEYS:
+                yield key
+        else:
+            pending_key = None
+
+
+def yarn_lock_names(chunks):
+    for line in iter_lines(chunks):
+        if not line or line[0] in ' \t#' or not line.rstrip().endswith(':'):
+            continue
+        # `"@babel/core@^7.0.0", "@babel/core@^7.1.0":` or `react@npm:^18.2.0:`
+        for spec in line.rstrip()[:-1].split(','):
+            spec = spec.strip().strip('"')
+            at = spec.find('@', 1)
+            if at > 0:
+                yield spec[:at]
+
+
+def toml_lock_names(chunks):
+    in_package = False
+    multiline = None
+    for line in iter_lines(chunks):
+        if multiline:
+            if multiline in line:
+                multiline = None
+            continue
+        if line.startswith('['):
+            in_package = line.strip() == '[[package]]'
+            continue
+        for quote in ('"""', "'''"):
+            if line.count(quote) == 1:
+                multiline = quote
+        if in_package:
+            match = _TOML_NAME.match(line)
+            if match:
+                yield match.group(1)
+
+
+LOCKFILE_PARSERS = {
+    'package-lock.json': package_lock_names,
+    'npm-shrinkwrap.json': package_lock_names,
+    'yarn.lock': yarn_lock_names,
+    'poetry.lock': toml_lock_names,
+    'Cargo.lock': toml_lock_names,
+}
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Featured-project scoring.
+
+A repo's score has two parts:
+
+- listing terms, computable from the repo listing alone (stars, forks,
+  watchers, activity, homepage, size, language)
+- detail terms, which need get_detailed_repo_metrics() and cost API calls
+  (contributors, releases, commits)
+
+Detail terms are bounded: contributor and release counts are capped
+(contributor_cap, release_cap), so listing score + detail_bound() is an
+upper bound on the full score. The ranker fetches details only for repos whose
+bound can still reach the top k. Contributors are most of that bound (500 of
+540 points), so the ranker fetches a repo's contributor count first, one
+request the full fetch would make anyway. detail_bound(weights, contributors)
+then leaves 40 points open, and releases and commits are fetched only for
+repos that can still reach the top k.
+
+Weights can be overridden with a JSON file of {name: value}.
+"""
+
+import json
+from datetime import datetime, timezone
+
+DEFAULT_WEIGHTS = {
+    # Listing terms
+    'stars': 3,
+    'forks': 2,
+    'watchers': 1,
+    'active_30d': 8,
+    'active_90d': 5,
+    'active_365d': 2,
+    'homepage': 8,
+    'size': 3,              # 100 KB < size < 50 MB
+    'popular_language': 2,
+    # Detail terms
+    'contributors': 5,
+    'releases': 4,
+    'release_90d': 10,
+    'release_365d': 5,
+    'commits_100': 5,
+    'commits_500': 5,
+    # Bounds on the detail terms and the inclusion threshold
+    'contributor_cap': 100,
+    'release_cap': 5,
+    'min_score': 5,
+}
+
+POPULAR_LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'Rust']
+
+
+def load_weights(path=None):
+    """DEFAULT_WEIGHTS overridden by the JSON object in `path`"""
+    weights = dict(DEFAULT_WEIGHTS)
+    if path:
+        with open(path) as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown ranking weights: {', '.join(sorted(unknown))}")
+        weights.update(overrides)
+    return weights
+
+
+def _days_since(timestamp, now):
+    return (now - datetime.fromisoformat(timestamp.replace('Z', '+00:00'))).days
+
+
+def listing_score(repo, weights, now=None):
+    """Score terms that only need the repo listing"""
+    now = now or datetime.now(timezone.utc)
+    score = 0
+    score += repo['stargazers_count'] * weights['stars']
+    score += repo.get('forks_count', 0) * weights['forks']
+    score += repo.get('watchers_count', 0) * weights['watchers']
+
+    days_old = _days_since(repo['updated_at'], now)
+    if days_old < 30:
+        score += weights['active_30d']
+    elif days_old < 90:
+        score += weights['active_90d']
+    elif days_old < 365:
+        score += weights['active_365d']
+
+    if repo['homepage']:
+        score += weights['homepage']
+    if 100 < repo.get('size', 0) < 50000:
+        score += weights['size']
+    if repo.get('language') in POPULAR_LANGUAGES:
+        score += weights['popular_language']
+    return score
+
+
+def detail_score(metrics, weights, now=None):
+    """Score terms that need get_detailed_repo_metrics()"""
+    now = now or datetime.now(timezone.utc)
+    score = min(metrics['contributors_count'], weights['contributor_cap']) * weights['contributors']
+
+    if metrics['releases_count']:
+        score += min(metrics['releases_count'], weights['release_cap']) * weights['releases']
+        if metrics['latest_release']:
+            try:
+                days_since_release = _days_since(metrics['latest_release']['published_at'], now)
+                if days_since_release < 90:
+                    score += weights['release_90d']
+                elif days_since_release < 365:
+                    score += weights['release_365d']
+            except (KeyError, TypeError, AttributeError, ValueError):
+                pass
+
+    if metrics['commits_count'] > 100:
+        score += weights['commits_100']
+    if metrics['commits_count'] > 500:
+        score += weights['commits_500']
+    return score
+
+
+def detail_bound(weights, contributors=None):
+    """Largest value detail_score() can return, for a known contributor count if given"""
+    cap = weights['contributor_cap'] if contributors is None else min(contributors, weights['contributor_cap'])
+    return (
+        max(cap * weights['contributors'], 0)
+        + max(weights['release_cap'] * weights['releases'], 0)
+        + max(weights['release_90d'], weights['release_365d'], 0)
+        + max(weights['commits_100'], 0)
+        + max(weights['commits_500'], 0)
+    )
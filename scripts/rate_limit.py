@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Rate-limit-aware scheduler for GitHub API calls.
+
+Every request acquires a token before it is sent and reports its response
+afterwards. The scheduler:
+
+- paces requests with a token bucket (GitHub's secondary limits punish bursts)
+- tracks the primary budget from X-RateLimit-Remaining / X-RateLimit-Reset
+- backs off on Retry-After and secondary-rate-limit 403/429 responses
+- serves waiting calls in priority order, and refuses low-priority calls once
+  the remaining budget is down to what high-priority calls still need
+
+Refused calls raise BudgetExhausted and are counted per endpoint, so a run that
+runs out of quota can say what it skipped instead of silently losing data.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+PRIORITY_HIGH = 0    # repo listing, metrics for likely featured repos
+PRIORITY_NORMAL = 1  # per-repo languages
+PRIORITY_LOW = 2     # long-tail manifest probes
+
+# Extra budget low-priority calls must leave untouched
+LOW_PRIORITY_MARGIN = 50
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+def endpoint_name(url):
+    """Short endpoint label for reporting: 'repos', 'languages', 'git/trees', ..."""
+    parts = [p for p in urlparse(url).path.split('/') if p]
+    if len(parts) >= 4 and parts[0] == 'repos':
+        if parts[3] == 'git' and len(parts) >= 5:
+            return f"git/{parts[4]}"
+        return parts[3]
+    return parts[-1] if parts else 'api'
+
+
+class RateLimitScheduler:
+    def __init__(self, rate=15.0, burst=30, max_wait=90):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait  # Longest back-off worth sleeping through
+        self.reserve = 0          # Budget held back for PRIORITY_HIGH calls
+
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None      # Epoch seconds
+        self.initial_remaining = None
+
+        self.stats = Counter()
+        self.skipped = Counter()
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiting = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _floor(self, priority):
+        if priority <= PRIORITY_HIGH:
+            return 0
+        if priority == PRIORITY_NORMAL:
+            return self.reserve
+        return self.reserve + LOW_PRIORITY_MARGIN
+
+    def _check_budget(self, priority, label, now):
+        blocked_for = self._blocked_until - now
+        if blocked_for > self.max_wait:
+            raise BudgetExhausted(f"rate limited for another {blocked_for:.0f}s")
+        if self.remaining is not None and self.remaining <= self._floor(priority):
+            if self.reset_at and self.reset_at - time.time() <= self.max_wait:
+                return
+            raise BudgetExhausted(f"{self.remaining} requests left, reserved for higher priority calls")
+
+    def acquire(self, priority=PRIORITY_NORMAL, label='api'):
+        """Block until `priority` may send a request; raise BudgetExhausted if it never will"""
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    try:
+                        self._check_budget(priority, label, now)
+                    except BudgetExhausted:
+                        self.skipped[label] += 1
+                        raise
+
+                    self._refill(now)
+                    if self._blocked_until > now:
+                        wait = self._blocked_until - now
+                    elif self._waiting[0] != ticket:
+                        wait = None  # A higher priority call goes first
+                    elif self._tokens < 1:
+                        wait = (1 - self._tokens) / self.rate
+                    elif self.remaining is not None and self.remaining <= 0:
+                        # Window nearly over (see _check_budget): sleep until reset
+                        wait = max(self.reset_at - time.time(), 0) + 1
+                        self.remaining = None
+                    else:
+                        self._tokens -= 1
+                        if self.remaining is not None:
+                            self.remaining -= 1
+                        self.stats['requests'] += 1
+                        return
+                    self._cond.wait(wait)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def record(self, response):
+        """Update the budget from response headers; return a back-off delay if the call should be retried"""
+        headers = response.headers
+        with self._cond:
+            if headers.get('X-RateLimit-Remaining') is not None:
+                remaining = int(headers['X-RateLimit-Remaining'])
+                reset_at = int(headers.get('X-RateLimit-Reset', 0)) or None
+                if self.initial_remaining is None:
+                    self.initial_remaining = remaining + 1
+                # Responses arrive out of order; within one window the lowest count is the latest
+                if reset_at != self.reset_at or self.remaining is None:
+                    self.remaining = remaining
+                else:
+                    self.remaining = min(self.remaining, remaining)
+                self.reset_at = reset_at
+                self.limit = int(headers.get('X-RateLimit-Limit', 0)) or self.limit
+
+            if response.status_code not in (403, 429):
+                return None
+
+            if headers.get('Retry-After'):
+                delay = float(headers['Retry-After'])
+            elif headers.get('X-RateLimit-Remaining') == '0' and self.reset_at:
+                delay = max(self.reset_at - time.time(), 0) + 1
+            elif 'rate limit' in response.text.lower():
+                # Secondary limit without Retry-After: GitHub asks for at least a minute
+                delay = 60.0
+            else:
+                return None  # A plain permission error
+
+            self.stats['rate_limited'] += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self._cond.notify_all()
+            return delay
+
+    def summary(self):
+        parts = [f"{self.stats['requests']} requests"]
+        if self.remaining is not None:
+            parts.append(f"{self.remaining}/{self.limit or '?'} budget left")
+        if self.stats['rate_limited']:
+            parts.append(f"{self.stats['rate_limited']} rate-limited responses")
+        return ", ".join(parts)
+
+    def skipped_summary(self):
+        return ", ".join(f"{label}: {count}" for label, count in sorted(self.skipped.items()))
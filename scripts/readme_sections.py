@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Marker-based README section rendering shared by the update scripts.
+
+Generated content lives between marker comments:
+
+    <!--START_SECTION:name-->
+    ...
+    <!--END_SECTION:name-->
+
+The README is tokenized once on these markers and any number of sections are
+replaced in a single linear pass. Repeated copies of a rendered section are
+dropped. Unchanged content is never rewritten, and writes go to a temp file
+that is renamed over the README, so an interrupted run never leaves a
+half-written file. plan_sections() renders without writing, for dry runs.
+"""
+
+import difflib
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+
+README_PATH = Path("README.md")
+
+MARKER_RE = re.compile(r'<!--(START|END)_SECTION:([\w-]+)-->')
+
+
+def start_marker(name):
+    return f"<!--START_SECTION:{name}-->"
+
+
+def end_marker(name):
+    return f"<!--END_SECTION:{name}-->"
+
+
+def wrap_section(name, body):
+    return f"{start_marker(name)}\n{body}\n{end_marker(name)}"
+
+
+def render_sections(content, sections):
+    """Replace the body of every marked section named in `sections`.
+
+    Returns (new_content, names of `sections` that were found).
+    """
+    out = []
+    found = set()
+    pos = 0             # End of the last emitted region
+    open_match = None   # START marker of the section being scanned
+
+    for match in MARKER_RE.finditer(content):
+        kind, name = match.groups()
+        if kind == 'START':
+            # Markers nested inside an open section are just body text
+            if open_match is None:
+                open_match = match
+            continue
+        if open_match is None or open_match.group(2) != name:
+            continue
+
+        out.append(content[pos:open_match.start()])
+        if name not in sections:
+            out.append(content[open_match.start():match.end()])
+        elif name not in found:
+            out.append(wrap_section(name, sections[name]))
+        # else: a duplicate copy of a rendered section; drop it
+        found.add(name)
+        pos = match.end()
+        open_match = None
+
+    out.append(content[pos:])
+    return "".join(out), found & set(sections)
+
+
+def read_readme(path=README_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def write_atomic(path, content):
+    """Write `content` to a temp file next to `path` and rename it into place"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent or '.', prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        # mkstemp creates 0600 files; keep the existing mode, or the usual 0644 for new files
+        try:
+            mode = path.stat().st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def content_hash(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def plan_sections(sections, path=README_PATH, insert_missing=None):
+    """Render `sections` into the README in memory.
+
+    `insert_missing(content, sections)` may add markers for sections the
+    README doesn't have yet.
+
+    Returns (current content, new content, names of sections that still have no markers).
+    """
+    content = read_readme(path)
+    new_content, found = render_sections(content, sections)
+    missing = set(sections) - found
+    if missing and insert_missing:
+        new_content = insert_missing(new_content, {name: sections[name] for name in missing})
+        missing = {name for name in missing if start_marker(name) not in new_content}
+    return content, new_content, missing
+
+
+def update_sections(sections, path=README_PATH, insert_missing=None):
+    """Render `sections` into the README with one read and at most one write.
+
+    The write is skipped when the rendered content hashes the same as what
+    is on disk. Returns (changed, names of sections that still have no markers).
+    """
+    content, new_content, missing = plan_sections(sections, path, insert_missing)
+    changed = content_hash(new_content) != content_hash(content)
+    if changed:
+        write_atomic(path, new_content)
+    return changed, missing
+
+
+def unified_diff(old, new, path=README_PATH):
+    """A `diff -u` style patch from `old` to `new`, empty if they are equal"""
+    name = Path(path).as_posix()
+    return ''.join(difflib.unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True),
+                                        fromfile=f"a/{name}", tofile=f"b/{name}"))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Changed-repository lists from dispatch and webhook payloads.
+
+An event run re-analyzes only the repos a payload names and patches them
+into the persisted listing and snapshot; the scheduled full sweep remains
+the reconciliation pass. Accepted payloads:
+
+- a repository_dispatch event file ($GITHUB_EVENT_PATH), whose
+  client_payload is read as below; its own "repository" is the repo the
+  workflow runs in, so a dispatch without a client_payload names nothing
+- {"repos": ["owner/name", {"repo": "owner/name", "events": ["release"]}],
+   "event": "push"}   (event / events apply to plain names)
+- {"repo": "owner/name", "event": "release"}
+- a GitHub webhook payload with a "repository" object; the event type is
+  inferred from its shape
+
+A payload that names no repository means "refresh everything".
+"""
+
+import json
+
+# Events after which the stored release/contributor/commit counts can't be trusted
+METRICS_EVENTS = frozenset(('push', 'release', 'member', 'public'))
+
+
+def _webhook_event(payload):
+    if 'release' in payload:
+        return 'release'
+    if 'commits' in payload or 'ref' in payload:
+        return 'push'
+    if 'starred_at' in payload:
+        return 'star'
+    return payload.get('action') or 'repository'
+
+
+def _is_dispatch(payload):
+    # repository_dispatch events carry the dispatched branch; webhook payloads don't
+    return 'client_payload' in payload or ('branch' in payload and 'sender' in payload)
+
+
+def parse_events(payload):
+    """{full name: set of event types} for the repositories a payload names"""
+    if _is_dispatch(payload):
+        payload = payload.get('client_payload')
+        if not isinstance(payload, dict):
+            return {}
+
+    default = payload.get('events') or [payload.get('event') or 'update']
+    if isinstance(default, str):
+        default = [default]
+
+    entries = payload.get('repos')
+    if entries is None:
+        repository = payload.get('repository') or payload.get('repo')
+        if isinstance(repository, dict):
+            # Webhook payload
+            entries = [{'repo': repository.get('full_name'),
+                        'events': [payload.get('event') or _webhook_event(payload)]}]
+        else:
+            entries = [repository] if repository else []
+
+    events = {}
+    for entry in entries:
+        if isinstance(entry, str):
+            name, types = entry, default
+        else:
+            name = entry.get('repo') or entry.get('full_name') or entry.get('name')
+            types = entry.get('events') or ([entry['event']] if entry.get('event') else default)
+        if not name or '/' not in name:
+            raise ValueError(f"expected an 'owner/name' repository, got {name!r}")
+        events.setdefault(name, set()).update(types)
+    return events
+
+
+def load_events(path):
+    with open(path) as f:
+        return parse_events(json.load(f))
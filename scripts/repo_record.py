@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Compact repository records.
+
+A REST repository object has around 90 fields, most of them URL templates.
+The analyzer reads fewer than twenty, so each repo is projected into a
+__slots__ record as soon as its page is decoded. Records support the dict
+reads the analyzer already uses (repo['name'], repo.get('pushed_at')).
+"""
+
+import re
+from urllib.parse import parse_qs, urlparse
+
+FIELDS = (
+    'name', 'full_name', 'description', 'html_url', 'homepage', 'language',
+    'fork', 'archived', 'private',
+    'stargazers_count', 'forks_count', 'watchers_count', 'open_issues_count', 'size',
+    'created_at', 'updated_at', 'pushed_at', 'default_branch',
+)
+_FIELD_SET = frozenset(FIELDS)
+
+_LAST_LINK_RE = re.compile(r'<([^>]+)>\s*;\s*rel="last"')
+
+
+class RepoRecord:
+    __slots__ = FIELDS
+
+    def __init__(self, **fields):
+        for field in FIELDS:
+            setattr(self, field, fields.get(field))
+
+    @classmethod
+    def from_api(cls, data):
+        """Project a REST (or REST-shaped GraphQL) repository dict"""
+        return cls(**{field: data.get(field) for field in FIELDS})
+
+    def __getitem__(self, key):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _FIELD_SET else default
+
+    def __contains__(self, key):
+        return key in _FIELD_SET
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __repr__(self):
+        return f"RepoRecord({self.full_name or self.name!r})"
+
+
+def last_page(link_header):
+    """Page number of the rel="last" link in a Link header, or None"""
+    match = _LAST_LINK_RE.search(link_header or '')
+    if not match:
+        return None
+    pages = parse_qs(urlparse(match.group(1)).query).get('page')
+    return int(pages[0]) if pages else None
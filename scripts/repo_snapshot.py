@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Persisted per-repo analysis records for incremental runs.
+
+Each record holds what one repository contributed to the analysis (language
+weights, technologies detected from manifests, release/contributor metrics)
+together with the pushed_at / updated_at values it was computed from. A repo
+whose timestamps have not moved since the last run is served from its record
+instead of being re-fetched, and tech_usage is rebuilt by summing records.
+Metrics only change with pushes, so they are keyed on pushed_at alone and
+survive updated_at bumps from stars or description edits.
+
+Stored contributions are also tagged with the detector version (a digest
+of tech_detector.py and lockfiles.py, as for BlobStore). A change to the
+detection rules or parsers re-analyzes every repo on the next run, pushed
+to or not.
+
+The last complete repo listing of each account is kept as well, so an
+event run can patch a few repos into it and re-rank without listing again.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+from blob_store import detector_version
+from repo_record import RepoRecord
+
+DEFAULT_SNAPSHOT_PATH = Path(".cache/repo-snapshot.json")
+SNAPSHOT_VERSION = 2
+
+# Release fields read by ranking and README rendering; the rest of the REST
+# release object (assets, body, author...) is not worth persisting
+RELEASE_FIELDS = ('tag_name', 'name', 'published_at', 'html_url')
+
+# Metrics that cost API calls; the rest come from the repo listing itself
+FETCHED_METRICS = ('releases_count', 'latest_release', 'contributors_count', 'commits_count')
+
+
+def trim_release(release):
+    return {key: release.get(key) for key in RELEASE_FIELDS}
+
+
+class SnapshotStore:
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH, detector=None):
+        self.path = Path(path)
+        self.detector = detector or detector_version()
+        self.records = {}
+        self.listings = {}  # "users/login" -> [repo dict, ...] in listing order
+        self.stats = {"reused": 0, "refreshed": 0, "stale": 0}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == SNAPSHOT_VERSION:
+            self.records = data.get("repos", {})
+            self.listings = data.get("listings", {})
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": SNAPSHOT_VERSION, "repos": self.records, "listings": self.listings}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def key(repo):
+        return repo.get('full_name') or repo['name']
+
+    def lookup(self, repo):
+        """Return the stored record for `repo` if it was computed from the current timestamps"""
+        record = self.records.get(self.key(repo))
+        if not record:
+            return None
+        if record.get('pushed_at') != repo.get('pushed_at') or record.get('updated_at') != repo.get('updated_at'):
+            return None
+        return record
+
+    def _record(self, repo):
+        """Return a writable record for `repo`, resetting it if its timestamps moved"""
+        record = self.lookup(repo)
+        if record is None:
+            old = self.records.get(self.key(repo), {})
+            record = {'pushed_at': repo.get('pushed_at'), 'updated_at': repo.get('updated_at')}
+            record.update((key, old[key]) for key in ('metrics', 'metrics_pushed_at') if key in old)
+            self.records[self.key(repo)] = record
+        return record
+
+    def contribution(self, repo):
+        """Return the stored {tech: weight} contribution for `repo`, or None if stale"""
+        record = self.lookup(repo)
+        if record is None or 'languages' not in record or record.get('detector') != self.detector:
+            return None
+        with self._lock:
+            self.stats["reused"] += 1
+        return self._sum(record)
+
+    def stale_contribution(self, repo):
+        """Return the last stored contribution for `repo` even if its timestamps moved"""
+        record = self.records.get(self.key(repo))
+        if not record or 'languages' not in record:
+            return None
+        with self._lock:
+            self.stats["stale"] += 1
+        return self._sum(record)
+
+    @staticmethod
+    def _sum(record):
+        usage = defaultdict(int, record['languages'])
+        for tech, weight in record['techs'].items():
+            usage[tech] += weight
+        return usage
+
+    def store_contribution(self, repo, languages, techs):
+        with self._lock:
+            record = self._record(repo)
+            record['languages'] = dict(languages)
+            record['techs'] = dict(techs)
+            record['detector'] = self.detector
+            self.stats["refreshed"] += 1
+
+    def metrics(self, repo):
+        """Return the stored metrics for `repo`, or None if it was pushed to since they were fetched"""
+        record = self.records.get(self.key(repo))
+        if not record or 'metrics' not in record or record.get('metrics_pushed_at') != repo.get('pushed_at'):
+            return None
+        return dict(record['metrics'])
+
+    def stale_metrics(self, repo):
+        record = self.records.get(self.key(repo))
+        if not record or 'metrics' not in record:
+            return None
+        with self._lock:
+            self.stats["stale"] += 1
+        return dict(record['metrics'])
+
+    def store_metrics(self, repo, metrics):
+        metrics = {key: metrics[key] for key in FETCHED_METRICS}
+        if metrics['latest_release']:
+            metrics['latest_release'] = trim_release(metrics['latest_release'])
+        with self._lock:
+            record = self.records.setdefault(self.key(repo), {'pushed_at': repo.get('pushed_at'),
+                                                              'updated_at': repo.get('updated_at')})
+            record['metrics'] = metrics
+            record['metrics_pushed_at'] = repo.get('pushed_at')
+
+    def forget_metrics(self, repo):
+        """Drop the stored metrics for `repo`, e.g. after a release that didn't move pushed_at"""
+        with self._lock:
+            record = self.records.get(self.key(repo))
+            if record:
+                record.pop('metrics', None)
+                record.pop('metrics_pushed_at', None)
+
+    def listing(self, owner):
+        """The stored listing of `owner` ("users/login" or "orgs/login") as repo records, or None"""
+        repos = self.listings.get(owner)
+        if repos is None:
+            return None
+        return [RepoRecord(**repo) for repo in repos]
+
+    def store_listing(self, owner, repos):
+        self.listings[owner] = [repo.to_dict() for repo in repos]
+
+    def prune(self, repos, owners):
+        """Forget repositories of `owners` (logins) that are not in their complete listing `repos`.
+
+        Records of other accounts are kept: the README run and multi-account
+        runs share this store, and each only lists its own accounts.
+        """
+        live = {self.key(repo) for repo in repos}
+        owners = {owner.lower() for owner in owners}
+        for name in list(self.records):
+            if name not in live and name.partition('/')[0].lower() in owners:
+                del self.records[name]
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Sharded analysis runs and the merge of their partial results.
+
+A shard analyzes only part of an account's repositories:
+
+- --shard K/N: repos whose full name hashes to K modulo N (0 <= K < N)
+- --repo-range FROM:TO: repos named FROM <= name < TO, case-insensitively;
+  either end may be left open
+
+It writes a partial result instead of README sections:
+
+    {"version": 1, "account": "users/login", "shard": {"hash": [1, 4]},
+     "repos": 250, "tech_usage": {tech: count},
+     "featured": [{"path": "owner/name", "project": {...}}]}
+
+Tech counts are per-repo sums, so partials add up in any order. Each shard
+keeps its own top-k featured projects, and the overall top k is always
+among them. The merge re-sorts their union by score, then stars, then path,
+which is the order and tie-breaking a single run uses, and keeps k. A
+merge of all N hash shards, or of ranges that tile the whole alphabet,
+renders the same README as one run over every repo.
+"""
+
+import argparse
+import hashlib
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from readme_sections import write_atomic
+
+PARTIAL_VERSION = 1
+DEFAULT_PARTIAL_DIR = Path("reports/partials")
+
+
+def parse_shard(spec):
+    """'1/4' -> {'hash': [1, 4]}"""
+    index, _, count = spec.partition('/')
+    if not (index.isdigit() and count.isdigit() and int(index) < int(count)):
+        raise argparse.ArgumentTypeError(f"expected K/N with 0 <= K < N, got {spec!r}")
+    return {'hash': [int(index), int(count)]}
+
+
+def parse_range(spec):
+    """'a:m' -> {'range': ['a', 'm']}; either end may be empty"""
+    if ':' not in spec:
+        raise argparse.ArgumentTypeError(f"expected FROM:TO, got {spec!r}")
+    start, end = (bound.lower() for bound in spec.split(':', 1))
+    if start and end and start >= end:
+        raise argparse.ArgumentTypeError(f"empty range {spec!r}")
+    return {'range': [start, end]}
+
+
+def shard_label(shard):
+    if 'hash' in shard:
+        return "{}/{}".format(*shard['hash'])
+    return "{}:{}".format(*shard['range'])
+
+
+def default_partial_path(shard):
+    if 'hash' in shard:
+        name = "shard-{}-of-{}".format(*shard['hash'])
+    else:
+        name = "range-{}-{}".format(*(bound or 'open' for bound in shard['range']))
+    return DEFAULT_PARTIAL_DIR / f"{name}.json"
+
+
+def in_shard(shard, path):
+    """Whether the repo 'owner/name' belongs to `shard`"""
+    if 'hash' in shard:
+        index, count = shard['hash']
+        return int(hashlib.sha1(path.lower().encode('utf-8')).hexdigest(), 16) % count == index
+    start, end = shard['range']
+    name = path.rsplit('/', 1)[-1].lower()
+    return name >= start and (not end or name < end)
+
+
+def write_partial(path, account, shard, repos, tech_usage, featured):
+    """Save a shard's result; `featured` is [(path, project)] in rank order"""
+    partial = {
+        'version': PARTIAL_VERSION,
+        'account': account,
+        'shard': shard,
+        'repos': repos,
+        'tech_usage': dict(sorted(tech_usage.items())),
+        'featured': [{'path': repo_path, 'project': project} for repo_path, project in featured],
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, json.dumps(partial, indent=1, sort_keys=True) + "\n")
+    return path
+
+
+def _check_coverage(shards):
+    """Raise ValueError unless the shards are disjoint and together cover every repo"""
+    if any('hash' in shard for shard in shards) and any('range' in shard for shard in shards):
+        raise ValueError("can't merge hash shards with name ranges")
+    if 'hash' in shards[0]:
+        counts = {shard['hash'][1] for shard in shards}
+        if len(counts) > 1:
+            raise ValueError(f"shards split the repos {' and '.join(map(str, sorted(counts)))} ways")
+        count = counts.pop()
+        indices = sorted(shard['hash'][0] for shard in shards)
+        if len(set(indices)) != len(indices):
+            raise ValueError("the same shard was given twice")
+        missing = sorted(set(range(count)) - set(indices))
+        if missing:
+            raise ValueError(f"missing shards {', '.join(f'{index}/{count}' for index in missing)}")
+        return
+    ranges = sorted((shard['range'] for shard in shards), key=lambda bounds: bounds[0])
+    end = ''
+    for i, (start, stop) in enumerate(ranges):
+        if start != end or (not stop and i != len(ranges) - 1):
+            raise ValueError(f"name ranges overlap or leave a gap at {start or end!r}")
+        end = stop
+    if end:
+        raise ValueError(f"no range covers names from {end!r}")
+
+
+def merge_partials(paths, limit=5):
+    """Combine partial results into {'account', 'repos', 'shards', 'tech_usage', 'featured'}.
+
+    Raises ValueError if the partials belong to different accounts or don't
+    cover the account exactly once.
+    """
+    partials = []
+    for path in paths:
+        with open(path) as f:
+            partial = json.load(f)
+        if partial.get('version') != PARTIAL_VERSION:
+            raise ValueError(f"{path}: unsupported partial version {partial.get('version')!r}")
+        partials.append(partial)
+    if not partials:
+        raise ValueError("no partial results given")
+
+    accounts = {partial['account'] for partial in partials}
+    if len(accounts) > 1:
+        raise ValueError(f"partials are for different accounts: {', '.join(sorted(accounts))}")
+    _check_coverage([partial['shard'] for partial in partials])
+
+    tech_usage = defaultdict(int)
+    candidates = []
+    for partial in partials:
+        for tech, count in partial['tech_usage'].items():
+            tech_usage[tech] += count
+        candidates.extend(partial['featured'])
+    # A single run ranks by score, ties going to more stars, then the lower path
+    candidates.sort(key=lambda entry: (-entry['project']['score'], -entry['project']['stars'],
+                                       entry['path'].lower()))
+    return {
+        'account': accounts.pop(),
+        'repos': sum(partial['repos'] for partial in partials),
+        'shards': sorted(shard_label(partial['shard']) for partial in partials),
+        'tech_usage': tech_usage,
+        'featured': [entry['project'] for entry in candidates[:limit]],
+    }
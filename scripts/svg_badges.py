@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Local SVG badges for the README.
+
+Instead of one img.shields.io request per badge, each README block (a tech
+stack category, a featured project's stats) is rendered into a single
+committed SVG under generated/badges/. Text is measured with a built-in
+DejaVu Sans advance-width table, so no font or network access is needed.
+
+A manifest next to the SVGs records the digest of each file's inputs. A
+file is only re-rendered and rewritten when its badges change, and files
+from earlier runs that are no longer referenced are removed.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import unquote
+from xml.sax.saxutils import escape
+
+from readme_sections import write_atomic
+
+DEFAULT_BADGE_DIR = Path("generated/badges")
+MANIFEST_NAME = "manifest.json"
+
+# Bump when the rendering changes so every badge is redrawn
+RENDERER_VERSION = 1
+
+# Widest row before badges wrap, in px (the README column is ~830px)
+MAX_ROW_WIDTH = 720
+GAP = 4
+
+FONT_FAMILY = "DejaVu Sans,Verdana,Geneva,sans-serif"
+
+# Advance widths of ASCII 32..126 at 11px, from DejaVuSans.ttf / DejaVuSans-Bold.ttf
+_ASCII = ''.join(chr(c) for c in range(32, 127))
+_REGULAR_WIDTHS = dict(zip(_ASCII, (
+    3.5, 4.41, 5.06, 9.22, 7.0, 10.45, 8.58, 3.02, 4.29, 4.29, 5.5, 9.22, 3.5, 3.97, 3.5, 3.71,
+    7.0, 7.0, 7.0, 7.0, 7.0, 7.0, 7.0, 7.0, 7.0, 7.0, 3.71, 3.71, 9.22, 9.22, 9.22, 5.84,
+    11.0, 7.52, 7.55, 7.68, 8.47, 6.95, 6.33, 8.52, 8.27, 3.24, 3.24, 7.21, 6.13, 9.49, 8.23, 8.66,
+    6.63, 8.66, 7.64, 6.98, 6.72, 8.05, 7.52, 10.88, 7.54, 6.72, 7.54, 4.29, 3.71, 4.29, 9.22, 5.5,
+    5.5, 6.74, 6.98, 6.05, 6.98, 6.77, 3.87, 6.98, 6.97, 3.06, 3.06, 6.37, 3.06, 10.72, 6.97, 6.73,
+    6.98, 6.98, 4.52, 5.73, 4.31, 6.97, 6.51, 9.0, 6.51, 6.51, 5.77, 7.0, 3.71, 7.0, 9.22,
+)))
+_BOLD_WIDTHS = dict(zip(_ASCII, (
+    3.83, 5.02, 5.73, 9.22, 7.65, 11.02, 9.59, 3.37, 5.03, 5.03, 5.75, 9.22, 4.18, 4.57, 4.18, 4.02,
+    7.65, 7.65, 7.65, 7.65, 7.65, 7.65, 7.65, 7.65, 7.65, 7.65, 4.4, 4.4, 9.22, 9.22, 9.22, 6.38,
+    11.0, 8.51, 8.38, 8.07, 9.13, 7.51, 7.51, 9.03, 9.21, 4.09, 4.09, 8.52, 7.01, 10.95, 9.21, 9.35,
+    8.06, 9.35, 8.47, 7.92, 7.5, 8.93, 8.51, 12.13, 8.48, 7.97, 7.98, 5.03, 4.02, 5.03, 9.22, 5.5,
+    5.5, 7.42, 7.87, 6.52, 7.87, 7.46, 4.79, 7.87, 7.83, 3.77, 3.77, 7.32, 3.77, 11.46, 7.83, 7.56,
+    7.87, 7.87, 5.42, 6.55, 5.26, 7.83, 7.17, 10.16, 7.1, 7.17, 6.4, 7.83, 4.02, 7.83, 9.22,
+)))
+
+# Shields.io named colors used by the README badges
+NAMED_COLORS = {
+    'blue': '007ec6', 'yellow': 'dfb317', 'green': '97ca00', 'orange': 'fe7d37',
+    'purple': '9f5ad9', 'lightgrey': '9f9f9f', 'grey': '555555',
+}
+
+# Per style: height, font size, bold, uppercase, letter spacing, horizontal padding
+STYLES = {
+    'for-the-badge': {'height': 28, 'size': 10, 'bold': True, 'upper': True, 'spacing': 1.25, 'pad': 12},
+    'flat-square': {'height': 20, 'size': 11, 'bold': False, 'upper': False, 'spacing': 0, 'pad': 6},
+}
+
+_SHIELD_RE = re.compile(r'!\[([^\]]*)\]\(https://img\.shields\.io/badge/(.*?)-([0-9A-Za-z]+)\?')
+
+
+@lru_cache(maxsize=4096)
+def text_width(text, size=11, bold=False):
+    """Rendered width of `text` in px"""
+    table = _BOLD_WIDTHS if bold else _REGULAR_WIDTHS
+    width = 0.0
+    for ch in text:
+        if ch in table:
+            width += table[ch]
+        elif unicodedata.east_asian_width(ch) in ('W', 'F'):
+            width += 11.0 * 1.15  # Emoji and CJK render about an em wide
+        elif unicodedata.combining(ch) or ch == '\ufe0f':
+            continue
+        else:
+            width += 7.0
+    return width * size / 11
+
+
+def parse_shield(markdown):
+    """(alt, message, hex color) of a static img.shields.io badge in markdown"""
+    match = _SHIELD_RE.search(markdown)
+    if not match:
+        return None
+    alt, message, color = match.groups()
+    message = unquote(message).replace('__', '\0').replace('_', ' ').replace('\0', '_').replace('--', '-')
+    return alt, message.lstrip('-'), color
+
+
+def _hex(color):
+    return '#' + NAMED_COLORS.get(color, color).lower()
+
+
+def _text_color(color):
+    """Dark text on light backgrounds, white otherwise"""
+    value = NAMED_COLORS.get(color, color)
+    r, g, b = (int(value[i:i + 2], 16) for i in (0, 2, 4))
+    return '#333' if (0.299 * r + 0.587 * g + 0.114 * b) / 255 > 0.65 else '#fff'
+
+
+@lru_cache(maxsize=1024)
+def render_badge(label, message, color, style):
+    """SVG fragment for one badge at the origin, and its width"""
+    spec = STYLES[style]
+    if spec['upper']:
+        label, message = label.upper(), message.upper()
+
+    def segment_width(text):
+        if not text:
+            return 0
+        measured = text_width(text, spec['size'], spec['bold']) + spec['spacing'] * len(text)
+        return round(measured + 2 * spec['pad'])
+
+    label_width, message_width = segment_width(label), segment_width(message)
+    height = spec['height']
+    baseline = height / 2 + spec['size'] * 0.35
+    weight = ' font-weight="bold"' if spec['bold'] else ''
+    spacing = f' letter-spacing="{spec["spacing"]}"' if spec['spacing'] else ''
+    parts = []
+    if label:
+        parts.append(f'<rect width="{label_width}" height="{height}" fill="#555"/>')
+        parts.append(f'<text x="{label_width / 2:g}" y="{baseline:g}" fill="#fff" text-anchor="middle"'
+                     f'{weight}{spacing}>{escape(label)}</text>')
+    parts.append(f'<rect x="{label_width}" width="{message_width}" height="{height}" fill="{_hex(color)}"/>')
+    parts.append(f'<text x="{label_width + message_width / 2:g}" y="{baseline:g}" fill="{_text_color(color)}" '
+                 f'text-anchor="middle"{weight}{spacing}>{escape(message)}</text>')
+    return ''.join(parts), label_width + message_width
+
+
+def render_sheet(badges, style, title=''):
+    """One SVG holding `badges` [(label, message, color)], wrapped into rows"""
+    height = STYLES[style]['height']
+    rows, x, y, width = [], 0, 0, 0
+    for label, message, color in badges:
+        fragment, badge_width = render_badge(label, message, color, style)
+        if x and x + badge_width > MAX_ROW_WIDTH:
+            x, y = 0, y + height + GAP
+        rows.append(f'<g transform="translate({x},{y})">{fragment}</g>')
+        x += badge_width + GAP
+        width = max(width, x - GAP)
+    total_height = y + height
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{total_height}" '
+        f'viewBox="0 0 {width} {total_height}" role="img" aria-label="{escape(title, {chr(34): "&quot;"})}">'
+        f'<title>{escape(title)}</title>'
+        f'<g font-family="{FONT_FAMILY}" font-size="{STYLES[style]["size"]}">'
+        + ''.join(rows) +
+        '</g></svg>\n'
+    )
+
+
+class BadgeSet:
+    """The SVGs of one run; unchanged files are left alone and unused ones removed on finish().
+
+    A dry run writes and removes nothing but counts what it would have done.
+    """
+
+    def __init__(self, directory=DEFAULT_BADGE_DIR, dry_run=False):
+        self.directory = Path(directory)
+        self.dry_run = dry_run
+        self.manifest_path = self.directory / MANIFEST_NAME
+        self.stats = {"rendered": 0, "unchanged": 0, "removed": 0}
+        try:
+            with open(self.manifest_path, "r") as f:
+                self.previous = json.load(f)
+        except (OSError, ValueError):
+            self.previous = {}
+        self.current = {}
+
+    def write(self, name, badges, style, title=''):
+        """Render `badges` to <directory>/<name>.svg if its inputs changed; returns the file's path"""
+        filename = f"{name}.svg"
+        path = self.directory / filename
+        digest = hashlib.sha1(json.dumps([RENDERER_VERSION, style, title, badges]).encode('utf-8')).hexdigest()
+        self.current[filename] = digest
+        if self.previous.get(filename) == digest and path.exists():
+            self.stats["unchanged"] += 1
+        elif self.dry_run:
+            self.stats["rendered"] += 1
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, render_sheet(badges, style, title))
+            self.stats["rendered"] += 1
+        return path.as_posix()
+
+    def finish(self):
+        """Remove SVGs this run no longer references and save the manifest"""
+        for filename in set(self.previous) - set(self.current):
+            if self.dry_run:
+                self.stats["removed"] += 1
+                continue
+            try:
+                (self.directory / filename).unlink()
+                self.stats["removed"] += 1
+            except OSError:
+                pass
+        if self.current != self.previous and not self.dry_run:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.manifest_path, json.dumps(self.current, indent=1, sort_keys=True) + "\n")
+
+    @property
+    def changed(self):
+        return bool(self.stats["rendered"] or self.stats["removed"])
+
+    def summary(self):
+        return f"{self.stats['rendered']} rendered, {self.stats['unchanged']} unchanged, {self.stats['removed']} removed"
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Rule-table-driven technology detection for manifest files.
+
+Manifests are parsed with real structured parsers (JSON, TOML, requirements
+syntax, go.mod, pom.xml) so rules match dependency *names* rather than raw
+text: `torch` no longer fires on `torchvision-free` and `next` no longer fires
+on every dependency containing "next". The names of a file are joined one
+per line and all patterns of an ecosystem run over them as one compiled
+regex, so each file costs one parse plus one finditer. Dockerfiles and
+compose files contribute the images they build FROM or run, matched on
+token boundaries.
+
+Lockfiles (package-lock.json, yarn.lock, poetry.lock, Cargo.lock) map to
+the same ecosystems and expose transitive dependencies. They are parsed a
+chunk at a time by lockfiles.py and never materialized as a document.
+
+Each detected technology is counted once per file with the rule's weight.
+"""
+
+import base64
+import json
+import re
+import xml.etree.ElementTree as ElementTree
+
+from lockfiles import LOCKFILE_PARSERS, iter_base64_text, iter_text_chunks
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# (tech, weight, {ecosystem: [dependency-name regexes]})
+# Names are lowercased before matching. PyPI names compare under PEP 503: a
+# '-' in a pypi pattern matches any run of '-', '_' and '.'.
+RULES = [
+    # Frontend
+    ('React', 5, {'npm': [r'react', r'react-dom']}),
+    ('Next.js', 5, {'npm': [r'next']}),
+    ('Vue', 5, {'npm': [r'vue', r'nuxt']}),
+    ('Angular', 5, {'npm': [r'@angular/core']}),
+    ('Svelte', 5, {'npm': [r'svelte', r'@sveltejs/kit']}),
+
+    # Backend
+    ('Express', 5, {'npm': [r'express']}),
+    ('Django', 5, {'pypi': [r'django']}),
+    ('FastAPI', 5, {'pypi': [r'fastapi']}),
+    ('Flask', 5, {'pypi': [r'flask']}),
+    ('Spring', 5, {'maven': [r'org\.springframework(\.boot)?:.+']}),
+
+    # AI/ML
+    ('TensorFlow', 5, {'pypi': [r'tensorflow(-cpu|-gpu|-macos)?'], 'npm': [r'@tensorflow/tfjs(-node)?']}),
+    ('PyTorch', 5, {'pypi': [r'torch', r'pytorch']}),
+    ('Transformers', 5, {'pypi': [r'transformers'], 'npm': [r'@huggingface/transformers', r'@xenova/transformers']}),
+    ('OpenAI', 5, {'pypi': [r'openai'], 'npm': [r'openai'], 'cargo': [r'async-openai'],
+                   'go': [r'github\.com/sashabaranov/go-openai']}),
+
+    # Databases
+    ('PostgreSQL', 3, {'docker': [r'postgres(ql)?', r'postgis'],
+                       'pypi': [r'psycopg2(-binary)?', r'psycopg', r'asyncpg'],
+                       'npm': [r'pg', r'postgres'],
+                       'cargo': [r'postgres', r'tokio-postgres'],
+                       'go': [r'github\.com/lib/pq', r'github\.com/jackc/pgx(/v\d+)?'],
+                       'maven': [r'org\.postgresql:postgresql']}),
+    ('MongoDB', 3, {'docker': [r'mongo(db)?'],
+                    'pypi': [r'pymongo', r'motor', r'mongoengine'],
+                    'npm': [r'mongodb', r'mongoose'],
+                    'cargo': [r'mongodb'],
+                    'go': [r'go\.mongodb\.org/mongo-driver'],
+                    'composer': [r'mongodb/mongodb'],
+                    'maven': [r'org\.mongodb:.+']}),
+    ('Redis', 3, {'docker': [r'redis'],
+                  'pypi': [r'redis'],
+                  'npm': [r'redis', r'ioredis'],
+                  'cargo': [r'redis'],
+                  'go': [r'github\.com/(go-redis|redis)/(go-)?redis(/v\d+)?'],
+                  'composer': [r'predis/predis']}),
+    ('MySQL', 3, {'docker': [r'mysql'],
+                  'pypi': [r'mysqlclient', r'pymysql', r'mysql-connector-python'],
+                  'npm': [r'mysql2?'],
+                  'cargo': [r'mysql(_async)?'],
+                  'go': [r'github\.com/go-sql-driver/mysql'],
+                  'maven': [r'(mysql:mysql-connector-java|com\.mysql:mysql-connector-j)']}),
+    ('SQLite', 3, {'npm': [r'sqlite3', r'better-sqlite3'],
+                   'cargo': [r'rusqlite'],
+                   'go': [r'github\.com/mattn/go-sqlite3']}),
+
+    # Cloud & DevOps
+    ('Kubernetes', 3, {'pypi': [r'kubernetes'], 'npm': [r'@kubernetes/client-node'], 'go': [r'k8s\.io/client-go']}),
+    ('AWS', 3, {'pypi': [r'boto3', r'botocore', r'aws-cdk-lib'],
+                'npm': [r'aws-sdk', r'@aws-sdk/.+', r'aws-cdk-lib'],
+                'cargo': [r'aws-sdk-.+', r'aws-config'],
+                'go': [r'github\.com/aws/aws-sdk-go(-v2)?(/.+)?']}),
+    ('GCP', 3, {'pypi': [r'google-cloud-.+'], 'npm': [r'@google-cloud/.+'], 'go': [r'cloud\.google\.com/go(/.+)?']}),
+    ('Azure', 3, {'pypi': [r'azure-.+'], 'npm': [r'@azure/.+'], 'go': [r'github\.com/azure/azure-sdk-for-go(/.+)?']}),
+]
+
+FILE_ECOSYSTEMS = {
+    'package.json': 'npm',
+    'requirements.txt': 'pypi',
+    'pyproject.toml': 'pypi',
+    'Pipfile': 'pypi',
+    'Cargo.toml': 'cargo',
+    'go.mod': 'go',
+    'composer.json': 'composer',
+    'pom.xml': 'maven',
+    'Dockerfile': 'docker',
+    'docker-compose.yml': 'docker',
+    'docker-compose.yaml': 'docker',
+    'compose.yml': 'docker',
+    'compose.yaml': 'docker',
+    # Lockfiles
+    'package-lock.json': 'npm',
+    'npm-shrinkwrap.json': 'npm',
+    'yarn.lock': 'npm',
+    'poetry.lock': 'pypi',
+    'Cargo.lock': 'cargo',
+}
+
+_REQUIREMENT_NAME = re.compile(r'\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+_REQUIREMENT_LINE = re.compile(r'^[ \t]*([A-Za-z0-9][A-Za-z0-9._-]*)', re.MULTILINE)
+_EGG_NAME = re.compile(r'^[ \t]*-.*#egg=([A-Za-z0-9._-]+)', re.MULTILINE)
+
+# Docker: image references of FROM lines and compose `image:` keys
+_IMAGE_REFERENCE = re.compile(r'\n[ \t]*(?:from[ \t]+(?:--\S+[ \t]+)*|-?[ \t]*image[ \t]*:[ \t]*)'
+                              r'''["']?([^\s"'#]+)''')
+
+
+# --- Parsers: manifest text -> iterable of dependency names ---
+
+def parse_package_json(text):
+    data = json.loads(text)
+    return [*data.get('dependencies', {}), *data.get('devDependencies', {})]
+
+
+def parse_composer_json(text):
+    data = json.loads(text)
+    return [*data.get('require', {}), *data.get('require-dev', {})]
+
+
+def parse_requirements_txt(text):
+    # Comment and option lines start with '#' / '-' and never match a name;
+    # editable / VCS installs carry the name in #egg=
+    names = _REQUIREMENT_LINE.findall(text)
+    if '#egg=' in text:
+        names += _EGG_NAME.findall(text)
+    return names
+
+
+def requirement_name(spec):
+    """Project name of a PEP 508 requirement string ('Django[bcrypt]>=4 ; ...' -> 'Django')"""
+    match = _REQUIREMENT_NAME.match(spec)
+    return match.group(1) if match else None
+
+
+def _load_toml(text):
+    if tomllib is None:
+        return {}
+    return tomllib.loads(text)
+
+
+def parse_pyproject_toml(text):
+    data = _load_toml(text)
+    specs = []
+    project = data.get('project', {})
+    specs += project.get('dependencies', [])
+    for group in project.get('optional-dependencies', {}).values():
+        specs += group
+    for group in data.get('dependency-groups', {}).values():
+        # Skips {include-group = "test"} entries
+        specs += [spec for spec in group if isinstance(spec, str)]
+    names = [requirement_name(spec) for spec in specs]
+
+    poetry = data.get('tool', {}).get('poetry', {})
+    names += list(poetry.get('dependencies', {}))
+    names += list(poetry.get('dev-dependencies', {}))
+    for group in poetry.get('group', {}).values():
+        names += list(group.get('dependencies', {}))
+    return [name for name in names if name and name.lower() != 'python']
+
+
+def parse_pipfile(text):
+    data = _load_toml(text)
+    return [*data.get('packages', {}), *data.get('dev-packages', {})]
+
+
+CARGO_SECTIONS = ('dependencies', 'dev-dependencies', 'build-dependencies')
+
+
+def parse_cargo_toml(text):
+    data = _load_toml(text)
+    tables = [data]
+    # [target.'cfg(unix)'.dependencies] etc. hold platform-specific dependencies
+    tables += [target for target in data.get('target', {}).values() if isinstance(target, dict)]
+    names = []
+    for table in tables:
+        for section in CARGO_SECTIONS:
+            for name, spec in table.get(section, {}).items():
+                # `alias = { package = "real-name" }` renames a crate
+                names.append(spec.get('package', name) if isinstance(spec, dict) else name)
+    return names
+
+
+def parse_go_mod(text):
+    names = []
+    in_block = False
+    for line in text.splitlines():
+        line = line.split('//', 1)[0].strip()
+        if in_block:
+            if line == ')':
+                in_block = False
+            elif line:
+                names.append(line.split()[0])
+        elif line.startswith('require'):
+            rest = line[len('require'):].strip()
+            if rest == '(':
+                in_block = True
+            elif rest:
+                names.append(rest.split()[0])
+    return names
+
+
+def parse_pom_xml(text):
+    root = ElementTree.fromstring(text)
+    names = []
+    for element in root.iter():
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag not in ('dependency', 'parent', 'plugin'):
+            continue
+        coords = {child.tag.rsplit('}', 1)[-1]: (child.text or '').strip() for child in element}
+        if coords.get('groupId') and coords.get('artifactId'):
+            names.append(f"{coords['groupId']}:{coords['artifactId']}")
+    return names
+
+
+def parse_images(text):
+    """Images a Dockerfile builds FROM or a compose file runs, e.g. 'bitnami/redis:7'"""
+    return _IMAGE_REFERENCE.findall('\n' + text.lower())
+
+
+PARSERS = {
+    'package.json': parse_package_json,
+    'composer.json': parse_composer_json,
+    'requirements.txt': parse_requirements_txt,
+    'pyproject.toml': parse_pyproject_toml,
+    'Pipfile': parse_pipfile,
+    'Cargo.toml': parse_cargo_toml,
+    'go.mod': parse_go_mod,
+    'pom.xml': parse_pom_xml,
+    **{filename: parse_images for filename, eco in FILE_ECOSYSTEMS.items() if eco == 'docker'},
+}
+
+PARSE_ERRORS = (ValueError, AttributeError, TypeError, ElementTree.ParseError)
+
+
+class TechDetector:
+    def __init__(self, rules=RULES):
+        self.rules = rules
+        self._scanners = {}
+        self._matchers = {}
+
+        ecosystems = {eco for _, _, patterns in rules for eco in patterns}
+        for eco in ecosystems:
+            alternatives = [
+                f"(?P<r{i}>{'|'.join(patterns[eco])})"
+                for i, (_, _, patterns) in enumerate(rules) if patterns.get(eco)
+            ]
+            combined = '|'.join(alternatives)
+            # The scanner runs the same patterns without the per-rule groups:
+            # an alternative that starts with a literal is then rejected on
+            # its first character, which keeps a miss cheap
+            scanned = '|'.join(pattern for _, _, patterns in rules for pattern in patterns.get(eco, ()))
+            if eco == 'pypi':
+                combined, scanned = (pattern.replace('-', '[-_.]+') for pattern in (combined, scanned))
+            if eco == 'docker':
+                # Image references: match whole tokens, e.g. `postgres:15`, `bitnami/redis`
+                self._scanners[eco] = re.compile(rf'\b(?:{scanned})\b', re.ASCII)
+            else:
+                # One name per line, so `.` never runs into the next name
+                self._scanners[eco] = re.compile(rf'\n(?:{scanned})(?=\n)')
+            self._matchers[eco] = re.compile(combined)
+
+    def _scan(self, eco, names):
+        """Indices of the rules matching any of `names`, in one pass over them"""
+        text = '\n' + '\n'.join(names).lower() + '\n'
+        hits = {match.group().lstrip('\n') for match in self._scanners[eco].finditer(text)}
+        return {int(self._matchers[eco].fullmatch(hit).lastgroup[1:]) for hit in hits}
+
+    def matched_rules(self, filename, content):
+        """Indices of the rules that fire for one file; lockfile content may be an iterable of text chunks"""
+        eco = FILE_ECOSYSTEMS.get(filename)
+        if eco not in self._matchers:
+            return set()
+
+        if filename not in LOCKFILE_PARSERS:
+            try:
+                return self._scan(eco, PARSERS[filename](content))
+            except PARSE_ERRORS:
+                return set()
+
+        names = []
+        try:
+            for name in LOCKFILE_PARSERS[filename](iter_text_chunks(content) if isinstance(content, str) else content):
+                names.append(name)
+        except PARSE_ERRORS:
+            # Lockfiles stream: keep what was read before the bad token
+            pass
+        return self._scan(eco, names)
+
+    def detect(self, filename, content):
+        """Return {tech: weight} for one manifest, in rule-table order"""
+        return {self.rules[i][0]: self.rules[i][1] for i in sorted(self.matched_rules(filename, content))}
+
+
+DETECTOR = TechDetector()
+
+
+def detect_technologies(filename, content):
+    return DETECTOR.detect(filename, content)
+
+
+def detect_encoded(filename, encoded):
+    """detect_technologies() for base64 blob content (a process pool task).
+
+    Lockfiles are decoded and parsed a chunk at a time.
+    """
+    if filename in LOCKFILE_PARSERS:
+        return DETECTOR.detect(filename, iter_base64_text(encoded))
+    return DETECTOR.detect(filename, base64.b64decode(encoded).decode('utf-8', errors='replace'))
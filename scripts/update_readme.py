@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Single entry point for every generated README section.
+
+Section producers run concurrently and return {section name: body}. Their
+output is assembled in memory and rendered into README.md in one pass, and
+the file is only rewritten when its content hash changes.
+
+To add a section, register a producer:
+
+    @producer('feed')
+    def feed_sections(args, metrics):
+        return {'feed': render_feed()}
+
+and add the matching <!--START_SECTION:feed--> / <!--END_SECTION:feed-->
+markers to the README. A producer that fails or returns nothing leaves its
+sections as they are.
+"""
+
+import argparse
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import analyze_repos
+import update_wakatime
+from instrumentation import RunMetrics
+from readme_sections import README_PATH, content_hash, read_readme, update_sections
+
+PRODUCERS = {}
+
+
+def producer(name):
+    """Register a section producer: fn(args, metrics) -> {section: body} or None"""
+    def register(fn):
+        PRODUCERS[name] = fn
+        return fn
+    return register
+
+
+@producer('github')
+def github_sections(args, metrics):
+    return analyze_repos.run_analysis(args, metrics)
+
+
+@producer('wakatime')
+def wakatime_sections(args, metrics):
+    with metrics.phase('wakatime'):
+        content = update_wakatime.collect_stats()
+    if content is None:
+        return None  # Nothing fetched and no history: keep the last rendered stats
+    return {update_wakatime.SECTION_NAME: content}
+
+
+def run_producers(args, metrics, names):
+    """Run the selected producers in parallel and merge their sections in registration order"""
+    def run(name):
+        try:
+            return PRODUCERS[name](args, metrics)
+        except Exception:
+            print(f"⚠️  Section producer '{name}' failed; leaving its sections unchanged")
+            traceback.print_exc()
+            metrics.count('producer_failures')
+            return None
+
+    sections = {}
+    with ThreadPoolExecutor(max_workers=len(names) or 1) as pool:
+        for name, result in zip(names, pool.map(run, names)):
+            if result:
+                sections.update(result)
+    return sections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate every README section and write README.md once")
+    analyze_repos.add_arguments(parser)
+    parser.add_argument('--only', action='append', choices=sorted(PRODUCERS),
+                        help="Run only this producer (repeatable)")
+    args = parser.parse_args()
+
+    metrics = RunMetrics(profile=args.profile)
+    names = [name for name in PRODUCERS if not args.only or name in args.only]
+
+    with metrics.phase('producers'):
+        sections = run_producers(args, metrics, names)
+
+    if args.check or args.diff:
+        status = analyze_repos.check_readme(args, sections, metrics)
+        print(f"🧾 Run report written to {metrics.write(args.report)}")
+        sys.exit(status)
+
+    print("📝 Updating README...")
+    with metrics.phase('readme_rewrite'):
+        if not sections:
+            print("Nothing to update.")
+            changed, missing = False, set()
+        else:
+            changed, missing = update_sections(sections, README_PATH, insert_missing=analyze_repos.insert_sections)
+
+    for name in sorted(missing):
+        print(f"⚠️  Markers for section '{name}' not found in README.md")
+    print("✅ README.md updated" if changed else "✅ README.md already up to date")
+
+    metrics.extra['readme'] = {
+        'sections': sorted(set(sections) - missing),
+        'changed': changed,
+        'sha256': content_hash(read_readme(README_PATH)),
+    }
+    print(f"🧾 Run report written to {metrics.write(args.report)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,102 @@
 #!/usr/bin/env python3
 """
 Fetch WakaTime stats from public API and inject into README.
-No secrets required — uses https://wakatime.com/api/v1/users/{username}/stats/last_7_days
+No secrets required — uses https://wakatime.com/api/v1/users/{username}/stats/{range}
+
+The last_7_days, last_30_days and all_time ranges are fetched concurrently
+through the shared resilient session (timeouts, retries, circuit breaker)
+with conditional requests. Each successful snapshot is appended
+to a local history, which provides the week-over-week trend and the last good
+stats when WakaTime is unreachable.
 """
 
-import requests
-import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import requests
+
+from http_cache import ResponseCache
+from http_client import ResilientSession
+from readme_sections import start_marker, end_marker, update_sections
+from wakatime_history import WakaTimeHistory
+
 WAKATIME_USERNAME = "musiliandrew"
-WAKATIME_API_URL = f"https://wakatime.com/api/v1/users/{WAKATIME_USERNAME}/stats/last_7_days"
+WAKATIME_STATS_URL = f"https://wakatime.com/api/v1/users/{WAKATIME_USERNAME}/stats"
+RANGES = ("last_7_days", "last_30_days", "all_time")
 README_PATH = Path("README.md")
+CACHE_DIR = Path(".cache/wakatime-api")
 
-# Markers for injection
-START_MARKER = "<!--START_SECTION:waka-->"
-END_MARKER = "<!--END_SECTION:waka-->"
+# Retry policy: attempts per range and the base of the exponential backoff (seconds).
+# 202 means WakaTime is still computing the range and the body is partial.
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 2.0
+RETRY_STATUSES = (202, 429, 500, 502, 503, 504)
+TIMEOUT = (5, 10)
 
 
-def fetch_wakatime_stats():
-    """Fetch last 7 days stats from public WakaTime API."""
-    try:
-        response = requests.get(WAKATIME_API_URL, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        print(f"⚠️  Failed to fetch WakaTime stats: {e}")
-        return None
+def make_session():
+    return ResilientSession(len(RANGES), timeout=TIMEOUT, retries=MAX_ATTEMPTS - 1,
+                            retry_statuses=RETRY_STATUSES, backoff_base=BACKOFF_BASE)
 
+# Markers for injection
+SECTION_NAME = "waka"
+START_MARKER = start_marker(SECTION_NAME)
+END_MARKER = end_marker(SECTION_NAME)
 
-def format_stats(data):
-    """Format WakaTime stats as a readable terminal breakdown."""
+
+def fetch_wakatime_stats(range_name="last_7_days", session=None, cache=None):
+    """Fetch one stats range from the public WakaTime API; the session retries with backoff."""
+    if session is None:
+        with make_session() as session:
+            return fetch_wakatime_stats(range_name, session, cache)
+    url = f"{WAKATIME_STATS_URL}/{range_name}"
+    try:
+        response = cache.get(session, url) if cache else session.get(url)
+        if response.status_code == 200:
+            payload = response.json()
+            return payload.get("data", payload)
+        error = f"HTTP {response.status_code}"
+    except (requests.RequestException, ValueError) as e:
+        error = e
+    print(f"⚠️  Failed to fetch WakaTime {range_name} stats: {error}")
+    return None
+
+
+def fetch_all_ranges(ranges=RANGES, cache=None):
+    """Fetch every range concurrently; failed ranges map to None."""
+    with make_session() as session, ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        results = pool.map(lambda name: fetch_wakatime_stats(name, session, cache), ranges)
+        results = dict(zip(ranges, results))
+    if session.stats.keys() - {'requests'}:
+        print(f"🌐 WakaTime HTTP: {session.summary()}")
+    return results
+
+
+def _duration(seconds):
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    return f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m"
+
+
+def _delta(seconds):
+    if abs(seconds) < 60:
+        return ""
+    return f"{'▲' if seconds > 0 else '▼'} {_duration(abs(seconds))}"
+
+
+def format_stats(data, previous=None, longer=None, as_of=None):
+    """Format WakaTime stats as a readable terminal breakdown.
+
+    `previous` is a week-old snapshot of the same range to show trends
+    against, `longer` maps range labels to snapshots shown as extra totals,
+    and `as_of` marks the stats as a fallback from that date.
+    """
     if not data:
         return "No stats available yet."
 
+    previous_languages = {lang["name"]: lang.get("total_seconds", 0)
+                          for lang in (previous or {}).get("languages", [])}
+
     lines = []
     lines.append("")
     lines.append("```text")
@@ -46,10 +110,10 @@ def format_stats(data):
             name = lang.get("name", "Unknown")
             seconds = lang.get("total_seconds", 0)
             percent = (seconds / total_seconds * 100) if total_seconds > 0 else 0
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            time_str = f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m"
-            lines.append(f"{name:<15} {percent:>5.1f}%  {time_str:>8}")
+            line = f"{name:<15} {percent:>5.1f}%  {_duration(seconds):>8}"
+            if previous:
+                line += f"  {_delta(seconds - previous_languages.get(name, 0)):>10}"
+            lines.append(line.rstrip())
         lines.append("")
 
     # Total time
@@ -57,9 +121,20 @@ def format_stats(data):
     total_hours = int(total_time // 3600)
     total_minutes = int((total_time % 3600) // 60)
     if total_hours > 0 or total_minutes > 0:
-        lines.append(f"Total:           {total_hours}h {total_minutes}m")
+        total_line = f"Total:           {total_hours}h {total_minutes}m"
     else:
-        lines.append("Total:           < 1 minute")
+        total_line = "Total:           < 1 minute"
+    if previous and _delta(total_time - previous.get("total_seconds", 0)):
+        total_line += f"  ({_delta(total_time - previous.get('total_seconds', 0))} vs last week)"
+    lines.append(total_line)
+
+    for label, snapshot in (longer or {}).items():
+        if snapshot:
+            lines.append(f"{label + ':':<16} {_duration(snapshot.get('total_seconds', 0))}")
+
+    if as_of:
+        lines.append("")
+        lines.append(f"(last updated {as_of[:10]}; WakaTime was unreachable)")
 
     lines.append("```")
     lines.append("")
@@ -67,27 +142,53 @@ def format_stats(data):
     return "\n".join(lines)
 
 
+def collect_stats(history=None, cache=None):
+    """Fetch all ranges, record them, and render the section; None if there is nothing to show."""
+    history = history or WakaTimeHistory()
+    cache = cache or ResponseCache(CACHE_DIR)
+    fetched = fetch_all_ranges(cache=cache)
+
+    snapshots = {}
+    for range_name in RANGES:
+        if fetched[range_name] is not None:
+            history.append(range_name, fetched[range_name])
+        snapshots[range_name] = history.latest(range_name)
+
+    current = snapshots["last_7_days"]
+    if current is None:
+        return None
+    as_of = None if fetched["last_7_days"] is not None else current["fetched_at"]
+    baseline = history.baseline("last_7_days", days=7)
+
+    return format_stats(
+        current["stats"],
+        previous=baseline["stats"] if baseline else None,
+        longer={"Last 30 days": (snapshots["last_30_days"] or {}).get("stats"),
+                "All time": (snapshots["all_time"] or {}).get("stats")},
+        as_of=as_of,
+    )
+
+
 def update_readme(content):
     """Inject formatted stats into README between markers."""
-    pattern = f"{re.escape(START_MARKER)}.*?{re.escape(END_MARKER)}"
-    replacement = f"{START_MARKER}\n{content}\n{END_MARKER}"
+    _, missing = update_sections({SECTION_NAME: content}, README_PATH)
 
     # If markers don't exist, warn but don't fail
-    if START_MARKER not in README_PATH.read_text():
+    if missing:
         print(f"⚠️  Markers not found in README.md. Add these lines where you want WakaTime stats:")
         print(f"  {START_MARKER}")
         print(f"  {END_MARKER}")
         return False
 
-    updated = re.sub(pattern, replacement, README_PATH.read_text(), flags=re.DOTALL)
-    README_PATH.write_text(updated)
     print("✅ README.md updated with WakaTime stats")
     return True
 
 
 def main():
-    stats = fetch_wakatime_stats()
-    content = format_stats(stats)
+    content = collect_stats()
+    if content is None:
+        print("⚠️  No WakaTime stats fetched and no history to fall back on; leaving README unchanged")
+        return
     update_readme(content)
 
 
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Append-only history of WakaTime stats snapshots.
+
+Every successful fetch of a range is appended as one JSON line, unless it
+is identical to the last snapshot stored for that range. The history gives
+trend baselines ("vs last week") and a last good snapshot to render when
+the API is unreachable.
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_HISTORY_PATH = Path(".cache/wakatime-history.jsonl")
+
+# Languages kept per snapshot; the README shows 8
+MAX_LANGUAGES = 20
+
+
+def trim_stats(data):
+    """Keep the fields format_stats() reads"""
+    return {
+        "total_seconds": data.get("total_seconds", 0),
+        "languages": [
+            {"name": lang.get("name", "Unknown"), "total_seconds": lang.get("total_seconds", 0)}
+            for lang in (data.get("languages") or [])[:MAX_LANGUAGES]
+        ],
+    }
+
+
+class WakaTimeHistory:
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = Path(path)
+        self.entries = []
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        self.entries.append(json.loads(line))
+                    except ValueError:
+                        continue  # A torn last line from an interrupted write
+        except OSError:
+            pass
+
+    def append(self, range_name, data, fetched_at=None):
+        """Record a snapshot of `range_name`; returns False if it matches the last one"""
+        stats = trim_stats(data)
+        last = self.latest(range_name)
+        if last and last["stats"] == stats:
+            return False
+        entry = {
+            "range": range_name,
+            "fetched_at": fetched_at or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "stats": stats,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        self.entries.append(entry)
+        return True
+
+    def latest(self, range_name):
+        for entry in reversed(self.entries):
+            if entry["range"] == range_name:
+                return entry
+        return None
+
+    def baseline(self, range_name, days):
+        """The newest snapshot of `range_name` at least `days` old, for trend deltas"""
+        cutoff = datetime.now(timezone.utc).timestamp() - days * 86400
+        for entry in reversed(self.entries):
+            if entry["range"] != range_name:
+                continue
+            fetched = datetime.fromisoformat(entry["fetched_at"].replace("Z", "+00:00")).timestamp()
+            if fetched <= cutoff:
+                return entry
+        return None